@@ -9,6 +9,8 @@
 # ///
 
 import getpass
+import re
+
 import pyperclip
 from rich.console import Console
 from rich.panel import Panel
@@ -18,7 +20,9 @@ console = Console()
 
 
 def anonymize_username(content: str, username: str) -> str:
-    return content.replace(username, "XXXXXX")
+    # One case-insensitive scan catches "kd", "KD", "Kd", ... in paths and emails.
+    pattern = re.compile(re.escape(username), re.IGNORECASE)
+    return pattern.sub("XXXXXX", content)
 
 
 def main() -> None:
@@ -11,10 +11,15 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import unquote, urlsplit
 import hashlib
+import mmap
+import os
 import re
+import threading
+import time
 from typing import Optional
 
 import httpx
@@ -31,22 +36,36 @@ from rich.progress import (
 
 console = Console()
 
+_UA_HEADERS = {"User-Agent": "httpx"}
+_RETRYABLE_STATUS = {408, 429}
+
+# Below this size a single connection is fast enough; splitting only adds overhead.
+_PARALLEL_MIN_SIZE = 16 * 1024 * 1024
+_WRITE_BUFFER = 1 << 20
+_MMAP_MIN_SIZE = 64 * 1024 * 1024
+_PROGRESS_BYTES = 1 << 20
+_PROGRESS_INTERVAL = 0.05  # seconds
+
 # ---------- filename helpers ----------
 
 
+# RFC 5987: filename*=utf-8''encoded-name.ext
+_CD_RFC5987 = re.compile(r'filename\*\s*=\s*([^\'";]+)\'\'([^;]+)', re.IGNORECASE)
+# filename="name.ext" or filename=name.ext
+_CD_PLAIN = re.compile(r'filename\s*=\s*"?(?P<fn>[^";]+)"?', re.IGNORECASE)
+
+
 def _filename_from_content_disposition(cd: str | None) -> Optional[str]:
     if not cd:
         return None
-    # RFC 5987: filename*=utf-8''encoded-name.ext
-    m = re.search(r'filename\*\s*=\s*([^\'";]+)\'\'([^;]+)', cd, re.IGNORECASE)
+    m = _CD_RFC5987.search(cd)
     if m:
         charset, enc_name = m.groups()
         try:
             return unquote(enc_name, encoding=charset, errors="replace")
         except LookupError:
             return unquote(enc_name)
-    # filename="name.ext" or filename=name.ext
-    m = re.search(r'filename\s*=\s*"?(?P<fn>[^";]+)"?', cd, re.IGNORECASE)
+    m = _CD_PLAIN.search(cd)
     if m:
         return m.group("fn")
     return None
@@ -59,24 +78,41 @@ def _filename_from_url(url: httpx.URL | str) -> Optional[str]:
     return name or None
 
 
+_SANITIZE_TABLE = str.maketrans(
+    {**{chr(c): "_" for c in range(0x20)}, "\\": "_", "/": "_"}
+)
+
+
 def _sanitize_filename(name: str) -> str:
-    name = name.replace("\\", "_").replace("/", "_").strip()
-    name = re.sub(r"[\x00-\x1f]", "_", name)
+    name = name.strip().translate(_SANITIZE_TABLE)
     return name or "download.bin"
 
 
 # ---------- hashing ----------
 
 
+def _hash_file_into(h, path: Path, chunk_size: int = 1024 * 1024):
+    with path.open("rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _MMAP_MIN_SIZE:
+            # Hash straight from the page cache; no copy into userspace buffers.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as mv:
+                    for off in range(0, size, chunk_size):
+                        h.update(mv[off : off + chunk_size])
+            return h
+        # Reuse one buffer for every read instead of allocating a fresh bytes per chunk.
+        buf = bytearray(chunk_size)
+        mv = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(mv[:n])
+    return h
+
+
 def _sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        while True:
-            b = f.read(chunk_size)
-            if not b:
-                break
-            h.update(b)
-    return h.hexdigest()
+    return _hash_file_into(hashlib.sha256(), path, chunk_size).hexdigest()
 
 
 # ---------- core download ----------
@@ -92,129 +128,215 @@ def _determine_filename(resp: httpx.Response, override_name: Optional[str]) -> s
     return _sanitize_filename(cd_name or url_name or "download.bin")
 
 
-def _start_progress(total: Optional[int]):
-    return Progress(
-        TextColumn("[cyan]Downloading[/cyan]"),
-        BarColumn(),
-        DownloadColumn(),
-        TransferSpeedColumn(),
-        TimeRemainingColumn(),
-        console=console,
-    ), {"total": total if total and total > 0 else None}
+def _parse_total(headers: httpx.Headers) -> Optional[int]:
+    v = headers.get("content-length")
+    return (int(v) or None) if v and v.isdecimal() else None
 
 
 def _supports_ranges(headers: httpx.Headers) -> bool:
     return headers.get("accept-ranges", "").lower() == "bytes"
 
 
+def _stream_into_file(
+    resp: httpx.Response,
+    temp_path: Path,
+    mode: str,
+    advance,
+    hasher=None,
+    offset: int = 0,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    # Progress is reported in batches; Rich locks and re-renders on every update.
+    pending = 0
+    written = 0
+    last = time.monotonic()
+    # A 1 MiB userspace buffer batches many small network chunks per write syscall.
+    # No up-front preallocation: the .part size is the --resume offset, so it
+    # must only ever cover bytes that actually arrived, even after a SIGKILL.
+    with temp_path.open(mode, buffering=_WRITE_BUFFER) as f:
+        if offset:
+            f.seek(offset)
+        # Take chunks as the socket delivers them; re-slicing to a fixed
+        # size only adds copies, and the write buffer does the batching.
+        for chunk in resp.iter_bytes():
+            if not chunk:
+                continue
+            if stop is not None and stop.is_set():
+                break  # a sibling part failed or the user hit Ctrl-C
+            f.write(chunk)
+            if hasher:
+                hasher.update(chunk)
+            pending += len(chunk)
+            written += len(chunk)
+            now = time.monotonic()
+            if pending >= _PROGRESS_BYTES or now - last > _PROGRESS_INTERVAL:
+                advance(pending)
+                pending = 0
+                last = now
+    if pending:
+        advance(pending)
+    return written
+
+
+class _RangeIgnored(RuntimeError):
+    """A ranged GET was answered with something other than 206."""
+
+
+def _download_parts(
+    client: httpx.Client,
+    url: str,
+    headers: dict[str, str],
+    temp_path: Path,
+    total: int,
+    parts: int,
+    advance,
+) -> None:
+    """Fetch `total` bytes as `parts` concurrent Range requests into `temp_path`."""
+    bounds = [(i * total // parts, (i + 1) * total // parts - 1) for i in range(parts)]
+    # Parts land out of order, so a killed run would leave a full-size file
+    # with holes. Assemble them where --resume never looks; only a complete
+    # file is moved to the .part path.
+    scratch = temp_path.with_name(temp_path.name + "s")
+
+    with scratch.open("wb") as f:
+        f.truncate(total)
+
+    stop = threading.Event()
+
+    def fetch(start: int, end: int) -> None:
+        with client.stream(
+            "GET", url, headers=headers | {"Range": f"bytes={start}-{end}"}
+        ) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise _RangeIgnored(f"Server ignored Range request bytes={start}-{end}")
+            # A server or proxy answering with some other range would
+            # otherwise be written at this offset and corrupt the file.
+            content_range = r.headers.get("content-range", "")
+            if content_range.partition("/")[0] != f"bytes {start}-{end}":
+                raise ValueError(
+                    f"Asked for bytes {start}-{end}, got Content-Range {content_range!r}"
+                )
+            n = _stream_into_file(r, scratch, "r+b", advance, offset=start, stop=stop)
+            if n != end - start + 1 and not stop.is_set():
+                raise ValueError(
+                    f"Part bytes={start}-{end} returned {n} of {end - start + 1} bytes"
+                )
+
+    pool = ThreadPoolExecutor(max_workers=parts)
+    try:
+        for fut in [pool.submit(fetch, a, b) for a, b in bounds]:
+            fut.result()
+    except BaseException:
+        # Surface the error (or Ctrl-C) now instead of waiting for the other
+        # parts to finish: drop queued ones and stop the running ones.
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        # A pre-sized, partially filled file can't be resumed by appending.
+        scratch.unlink(missing_ok=True)
+        raise
+    pool.shutdown()
+    scratch.replace(temp_path)
+
+
 def _download_one(
     client: httpx.Client,
+    progress: Progress,
     url: str,
     dir: Path,
     name_override: Optional[str],
     resume: bool,
     overwrite: bool,
     sha256: Optional[str],
-    chunk_size: int = 1 << 15,  # 32 KiB
+    parts: int = 1,
 ) -> Path:
-    headers = {"User-Agent": "httpx"}
+    headers = _UA_HEADERS
     temp_path: Optional[Path] = None
+    # Hash while streaming so verification doesn't re-read the whole file.
+    hasher = hashlib.sha256() if sha256 else None
+    task = None
+
+    def advance(n: int) -> None:
+        progress.update(task, advance=n)
 
-    # Try HEAD to learn size/ranges (not all servers support it)
     try:
-        head = client.head(url, headers=headers)
-        head.raise_for_status()
-        total = int(head.headers.get("content-length", "0")) or None
-        range_ok = _supports_ranges(head.headers)
-    except Exception:
-        total = None
-        range_ok = False
-
-    # Open streaming GET to learn final filename and maybe size
-    with client.stream("GET", url, headers=headers) as r0:
-        r0.raise_for_status()
-        filename = _determine_filename(r0, name_override)
-        final_path = dir / filename
-        temp_path = dir / (filename + ".part")
-
-        if total is None:
-            try:
-                total = int(r0.headers.get("content-length", "0")) or None
-            except Exception:
-                total = None
-
-        if resume and temp_path.exists():
-            existing = temp_path.stat().st_size
-            if existing > 0 and (range_ok or _supports_ranges(r0.headers)):
-                r0.close()
-                # Reopen with Range
-                resp = client.get(
-                    url, headers=headers | {"Range": f"bytes={existing}-"}, stream=True
-                )
-                if resp.status_code == 206:
-                    part_len = int(resp.headers.get("content-length", "0") or 0)
-                    total_effective = (existing + part_len) if part_len else None
-                    progress, opts = _start_progress(total_effective)
-                    with progress:
-                        task = progress.add_task(
-                            "download",
-                            total=opts["total"],
-                            completed=existing if opts["total"] else 0,
-                        )
-                        with temp_path.open("ab") as f:
-                            for chunk in resp.iter_bytes(chunk_size=chunk_size):
-                                if not chunk:
-                                    continue
-                                f.write(chunk)
-                                progress.update(task, advance=len(chunk))
-                    resp.close()
+        # The streaming GET carries everything a HEAD would (size, ranges, final
+        # URL), so skip the extra round-trip.
+        with client.stream("GET", url, headers=headers) as r0:
+            r0.raise_for_status()
+            filename = _determine_filename(r0, name_override)
+            final_path = dir / filename
+            temp_path = dir / (filename + ".part")
+
+            total = _parse_total(r0.headers)
+            range_ok = _supports_ranges(r0.headers)
+
+            if resume and temp_path.exists():
+                existing = temp_path.stat().st_size
+                if existing > 0 and range_ok:
+                    r0.close()
+                    # Reopen with Range
+                    with client.stream(
+                        "GET", url, headers=headers | {"Range": f"bytes={existing}-"}
+                    ) as resp:
+                        resumed = resp.status_code == 206
+                        if resumed:
+                            part_len = _parse_total(resp.headers)
+                            total_effective = (
+                                (existing + part_len) if part_len else None
+                            )
+                            task = progress.add_task(
+                                "download",
+                                total=total_effective,
+                                completed=existing if total_effective else 0,
+                            )
+                            if hasher:
+                                _hash_file_into(hasher, temp_path)
+                            _stream_into_file(resp, temp_path, "ab", advance, hasher)
+                    if not resumed:
+                        if not overwrite and final_path.exists():
+                            raise FileExistsError(
+                                f"File exists and server didn't support resume: {final_path}"
+                            )
+                        task = progress.add_task("download", total=total)
+                        with client.stream("GET", url, headers=headers) as r:
+                            r.raise_for_status()
+                            _stream_into_file(r, temp_path, "wb", advance, hasher)
                 else:
-                    resp.close()
                     if not overwrite and final_path.exists():
                         raise FileExistsError(
-                            f"File exists and server didn't support resume: {final_path}"
+                            f"File exists and resume not possible: {final_path}"
                         )
-                    progress, opts = _start_progress(total)
-                    with progress:
-                        task = progress.add_task("download", total=opts["total"])
-                        with temp_path.open("wb") as f:
-                            with client.stream("GET", url, headers=headers) as r:
-                                r.raise_for_status()
-                                for chunk in r.iter_bytes(chunk_size=chunk_size):
-                                    if not chunk:
-                                        continue
-                                    f.write(chunk)
-                                    progress.update(task, advance=len(chunk))
+                    task = progress.add_task("download", total=total)
+                    _stream_into_file(r0, temp_path, "wb", advance, hasher)
             else:
-                if not overwrite and final_path.exists():
-                    raise FileExistsError(
-                        f"File exists and resume not possible: {final_path}"
-                    )
-                progress, opts = _start_progress(total)
-                with progress:
-                    task = progress.add_task("download", total=opts["total"])
-                    with temp_path.open("wb") as f:
-                        for chunk in r0.iter_bytes(chunk_size=chunk_size):
-                            if not chunk:
-                                continue
-                            f.write(chunk)
-                            progress.update(task, advance=len(chunk))
-        else:
-            if final_path.exists() and not overwrite:
-                raise FileExistsError(f"File already exists: {final_path}")
-            progress, opts = _start_progress(total)
-            with progress:
-                task = progress.add_task("download", total=opts["total"])
-                with temp_path.open("wb") as f:
-                    for chunk in r0.iter_bytes(chunk_size=chunk_size):
-                        if not chunk:
-                            continue
-                        f.write(chunk)
-                        progress.update(task, advance=len(chunk))
+                if final_path.exists() and not overwrite:
+                    raise FileExistsError(f"File already exists: {final_path}")
+                task = progress.add_task("download", total=total)
+                if parts > 1 and range_ok and total and total >= _PARALLEL_MIN_SIZE:
+                    r0.close()
+                    try:
+                        _download_parts(
+                            client, url, headers, temp_path, total, parts, advance
+                        )
+                        # Parts arrive out of order; fall back to hashing the file.
+                        hasher = None
+                    except _RangeIgnored:
+                        # Advertised `accept-ranges: bytes` but answered 200:
+                        # fetch the file as a single stream instead.
+                        progress.reset(task, total=total)
+                        with client.stream("GET", url, headers=headers) as r:
+                            r.raise_for_status()
+                            _stream_into_file(r, temp_path, "wb", advance, hasher)
+                else:
+                    _stream_into_file(r0, temp_path, "wb", advance, hasher)
+    finally:
+        if task is not None:
+            progress.remove_task(task)
 
     # Optional verify hash
     if sha256:
-        digest = _sha256_file(temp_path)
+        digest = hasher.hexdigest() if hasher else _sha256_file(temp_path)
         if digest.lower() != sha256.lower():
             temp_path.unlink(missing_ok=True)
             raise ValueError(
@@ -241,6 +363,13 @@ def main(
         False, "--overwrite", help="Overwrite existing files if present."
     ),
     timeout: float = typer.Option(60.0, help="HTTP timeout (seconds)."),
+    parts: int = typer.Option(
+        4,
+        "--parts",
+        "-p",
+        min=1,
+        help="Parallel Range connections for large files (1 disables splitting).",
+    ),
     sha256: Optional[str] = typer.Option(
         None, help="Expected SHA-256 for the downloaded file (only if one URL)."
     ),
@@ -248,10 +377,11 @@ def main(
     """
     Generic downloader: follows redirects, smart filenames, resume, progress bar, retries, optional SHA-256.
     """
-    if len(urls) > 1 and name:
+    n_urls = len(urls)
+    if n_urls > 1 and name:
         typer.echo("Ignoring --name because multiple URLs were provided.", err=True)
         name = None
-    if len(urls) > 1 and sha256:
+    if n_urls > 1 and sha256:
         typer.echo("Ignoring --sha256 because multiple URLs were provided.", err=True)
         sha256 = None
 
@@ -261,31 +391,52 @@ def main(
     failed: list[tuple[str, str]] = []
     attempts = 3
 
-    with httpx.Client(
-        follow_redirects=True, timeout=timeout, headers={"User-Agent": "httpx"}
-    ) as client:
+    # Keep enough idle connections for every Range part so later files and
+    # retries against the same host reuse them instead of re-handshaking.
+    # HTTP/1.1 on purpose: HTTP/2 would multiplex the parts onto one TCP stream.
+    limits = httpx.Limits(max_connections=parts * 2, max_keepalive_connections=parts)
+    with (
+        httpx.Client(
+            follow_redirects=True,
+            timeout=timeout,
+            headers=_UA_HEADERS,
+            limits=limits,
+        ) as client,
+        Progress(
+            TextColumn("[cyan]Downloading[/cyan]"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console,
+        ) as progress,
+    ):
         for i, url in enumerate(urls, 1):
-            console.rule(f"[bold]({i}/{len(urls)}) {url}")
+            console.rule(f"[bold]({i}/{n_urls}) {url}")
             last_err = None
             for attempt in range(1, attempts + 1):
                 try:
                     out = _download_one(
                         client=client,
+                        progress=progress,
                         url=url,
                         dir=dir,
                         name_override=name,
                         resume=resume,
                         overwrite=overwrite,
-                        sha256=sha256 if len(urls) == 1 else None,
+                        sha256=sha256,
+                        parts=parts,
                     )
                     console.print(f"[green]Saved:[/green] {out}")
                     succeeded.append(out)
                     last_err = None
                     break
                 except httpx.HTTPStatusError as e:
-                    last_err = (
-                        f"HTTP {e.response.status_code} {e.response.reason_phrase}"
-                    )
+                    code = e.response.status_code
+                    last_err = f"HTTP {code} {e.response.reason_phrase}"
+                    if code not in _RETRYABLE_STATUS and code < 500:
+                        # Client errors (404, 403, ...) won't succeed on retry.
+                        break
                 except FileExistsError as e:
                     last_err = str(e)
                     break
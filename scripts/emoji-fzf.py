@@ -4,31 +4,37 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "emoji",
-#     "typer",
 #     "rich",
 # ]
 # ///
 """
-emoji-fzf: fuzzy-search emojis or all Unicode characters with a Rich preview
+emoji-fzf: fuzzy-search emojis or all Unicode characters with a preview pane
 """
 
 from __future__ import annotations
 
+import argparse
+import functools
+import importlib.metadata
+import itertools
 import os
 import shlex
 import shutil
+import socket
 import subprocess
 import sys
+import tempfile
+import threading
 import unicodedata
-from typing import Iterable, Literal
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, Literal
 
-import typer
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
+if TYPE_CHECKING:
+    from rich.console import Console
 
-app = typer.Typer(add_completion=False)
-console = Console()
+DELIMITER = "\t"
+# Lines per batch written to fzf while the cache is being built.
+_CHUNK_ROWS = 4096
 
 # Fitzpatrick skin-tone modifiers
 SKIN_MODS = [
@@ -73,6 +79,7 @@ CATEGORY_NAMES = {
 }
 
 
+@functools.cache
 def _get_emoji_data() -> dict[str, dict]:
     # Prefer top-level EMOJI_DATA (emoji >=2.x), fall back if needed.
     try:
@@ -91,6 +98,7 @@ def _get_emoji_data() -> dict[str, dict]:
             )
 
 
+@functools.cache
 def _codepoints(s: str) -> str:
     return " ".join(f"U+{ord(c):04X}" for c in s)
 
@@ -106,85 +114,85 @@ def _safe_name(ch: str) -> str:
         return ""
 
 
+# https://www.unicode.org/roadmaps/ (indexed by plane number, i.e. cp >> 16)
+PLANE_NAMES = ("BMP", "SMP", "SIP", "TIP", "SSP")
+
+
 def _plane_of(cp: int) -> str:
-    # https://www.unicode.org/roadmaps/
-    if cp <= 0xFFFF:
-        return "BMP"
-    if cp <= 0x1FFFF:
-        return "SMP"
-    if cp <= 0x2FFFF:
-        return "SIP"
-    if cp <= 0x3FFFF:
-        return "TIP"
-    if cp <= 0x4FFFF:
-        return "SSP"
-    return "Plane?"
-
-
-def _emoji_rows() -> list[tuple[str, str]]:
+    plane = cp >> 16
+    return PLANE_NAMES[plane] if plane < len(PLANE_NAMES) else "Plane?"
+
+
+@functools.cache
+def _emoji_name(glyph: str) -> str:
+    # Title-cased once per glyph; the preview server re-renders the same emoji often.
+    info = _get_emoji_data()[glyph]
+    return (info.get("en") or info.get("name") or _safe_name(glyph) or "").title()
+
+
+def _emoji_line(ch: str, info: dict) -> str:
+    get = info.get
+    name = _emoji_name(ch)
+    group = str(get("group") or "")
+    subgroup = str(get("subgroup") or get("sub_group") or "")
+    tags = list(get("aliases") or [])
+    t = get("tags")
+    if isinstance(t, (list, tuple)):
+        tags.extend(t)
+    right = " • ".join([s for s in (name, group, subgroup) if s])
+    trail = ("    " + " ".join(["#" + t for t in tags])) if tags else ""
+    return f"{ch}{DELIMITER}{ch}  {right}{trail}"
+
+
+def _emoji_rows() -> Iterator[str]:
     """
-    Build TAB-delimited rows: (glyph, display text) for emoji.
+    Yield TAB-delimited fzf lines: "glyph<TAB>display text" for emoji.
     """
-    EMOJI_DATA = _get_emoji_data()
-    rows: list[tuple[str, str]] = []
-    for ch, info in EMOJI_DATA.items():
-        name = (info.get("en") or info.get("name") or _safe_name(ch) or "").title()
-        group = str(info.get("group") or "")
-        subgroup = str(info.get("subgroup") or info.get("sub_group") or "")
-        aliases = info.get("aliases") or []
-        tags = list(aliases or [])
-        t = info.get("tags")
-        if isinstance(t, (list, tuple)):
-            tags.extend(t)
-        right = " • ".join(filter(None, [name, group, subgroup]))
-        trail = ("    " + " ".join(f"#{t}" for t in tags)) if tags else ""
-        display = f"{ch}  {right}{trail}"
-        rows.append((ch, display))
-    rows.sort(key=lambda r: r[1].lower())
-    return rows
+    return (_emoji_line(ch, info) for ch, info in _get_emoji_data().items())
 
 
-def _iter_unicode_chars(include_plane: Literal["bmp", "all"]) -> Iterable[str]:
-    start = 0x0000
+def _iter_unicode_chars(
+    include_plane: Literal["bmp", "all"],
+) -> Iterable[tuple[str, str]]:
+    """
+    Yield (char, name) for every assigned (named) scalar value in the plane range.
+    """
     end = 0x10FFFF if include_plane == "all" else 0xFFFF
-    for cp in range(start, end + 1):
-        # Skip surrogates; these are not real scalar values
-        if 0xD800 <= cp <= 0xDFFF:
-            continue
-        ch = chr(cp)
-        # Only include assigned codepoints (those with a name)
-        try:
-            _ = unicodedata.name(ch)
-        except ValueError:
-            continue
-        yield ch
+    # Walk the ranges on either side of the surrogates (not real scalar values),
+    # and look each name up once with a default instead of raising.
+    for lo, hi in ((0x0000, 0xD7FF), (0xE000, end)):
+        for cp in range(lo, hi + 1):
+            ch = chr(cp)
+            name = unicodedata.name(ch, "")
+            if name:
+                yield ch, name
 
 
-def _unicode_rows(include_plane: Literal["bmp", "all"]) -> list[tuple[str, str]]:
+def _unicode_rows(include_plane: Literal["bmp", "all"]) -> Iterator[str]:
     """
-    Build rows for all assigned Unicode scalar values (by chosen plane range).
+    Yield fzf lines for all assigned Unicode scalar values (by chosen plane range).
     Display: "<glyph>  <Name> • <Category> • <Plane> [#tags]"
     """
-    rows: list[tuple[str, str]] = []
-    for ch in _iter_unicode_chars(include_plane):
-        name = _safe_name(ch)
-        cat = unicodedata.category(ch)
-        cat_hr = CATEGORY_NAMES.get(cat, cat)
-        cp = ord(ch)
-        plane = _plane_of(cp)
-        tags = []
-        if unicodedata.combining(ch):
-            tags.append("combining")
+    # Bind hot-loop lookups to locals; this runs once per assigned codepoint.
+    category = unicodedata.category
+    combining = unicodedata.combining
+    mirrored = unicodedata.mirrored
+    cat_names = CATEGORY_NAMES
+    plane_of = _plane_of
+    for ch, name in _iter_unicode_chars(include_plane):
+        cat = category(ch)
+        cat_hr = cat_names.get(cat, cat)
+        plane = plane_of(ord(ch))
+        tags = ""
+        if combining(ch):
+            tags += " #combining"
         if cat.startswith("C"):
-            tags.append("control")
-        if unicodedata.mirrored(ch):
-            tags.append("mirrored")
-        right = " • ".join([name or "—", cat_hr, plane])
-        trail = ("    " + " ".join(f"#{t}" for t in tags)) if tags else ""
-        display = f"{ch}  {right}{trail}"
-        rows.append((ch, display))
-    rows.sort(key=lambda r: r[1].lower())
-    return rows
+            tags += " #control"
+        if mirrored(ch):
+            tags += " #mirrored"
+        # One f-string per row instead of separate right/trail/display temporaries.
+        trail = f"   {tags}" if tags else ""
+        yield f"{ch}{DELIMITER}{ch}  {name} • {cat_hr} • {plane}{trail}"
 
 
 def _ensure_fzf() -> str:
@@ -194,17 +202,16 @@ def _ensure_fzf() -> str:
     return fzf
 
 
-def _print_emoji_preview(glyph: str) -> bool:
+def _emoji_fields(glyph: str) -> tuple[list[tuple[str, str]], list[str], bool] | None:
     """
-    Try printing an emoji-focused preview.
-    Returns True if glyph looked up via emoji data, else False to fall back.
+    Preview rows, variations and skin-tone support for an emoji,
+    or None if the glyph isn't in the emoji data.
     """
-    EMOJI_DATA = _get_emoji_data()
-    info = EMOJI_DATA.get(glyph)
+    info = _get_emoji_data().get(glyph)
     if info is None:
-        return False
+        return None
 
-    name = (info.get("en") or info.get("name") or _safe_name(glyph) or "").title()
+    name = _emoji_name(glyph)
     group = str(info.get("group") or "—")
     subgroup = str(info.get("subgroup") or info.get("sub_group") or "—")
     ver_val = info.get("E")
@@ -214,43 +221,19 @@ def _print_emoji_preview(glyph: str) -> bool:
     variations = [str(v) for v in (info.get("variations") or [])]
     tone_support = bool(info.get("skin_tone_support"))
 
-    tbl = Table(show_header=False, box=None, pad_edge=False)
-    tbl.add_row("Glyph", Text(f"{glyph}"))
-    tbl.add_row("Name", Text(name or "—", style="bold"))
-    tbl.add_row("Group", f"{group} / {subgroup}")
-    tbl.add_row("Emoji ver.", ver)
-    tbl.add_row("Status", status)
-    tbl.add_row("Codepoints", _codepoints(glyph))
-    tbl.add_row("UTF-8", _utf8_bytes(glyph))
-    console.print(tbl)
-
-    # Variations
-    if variations:
-        console.print()
-        console.print(Text("Variations", style="bold"))
-        for v in variations[:8]:
-            console.print(f"{v}   {_codepoints(v)}")
-        if len(variations) > 8:
-            console.print(f"… {len(variations) - 8} more")
-
-    # Skin tones
-    if tone_support:
-        console.print()
-        console.print(Text("Skin tones", style="bold"))
-        tones = [glyph + m for m in SKIN_MODS]
-        console.print("  " + "  ".join(tones))
-        console.print("  " + "  ".join(_codepoints(t) for t in tones))
-        console.print(
-            Text(
-                "Tip: After selecting the base emoji, append a skin tone modifier.",
-                style="dim",
-            )
-        )
-
-    return True
+    rows = [
+        ("Glyph", glyph),
+        ("Name", name or "—"),
+        ("Group", f"{group} / {subgroup}"),
+        ("Emoji ver.", ver),
+        ("Status", status),
+        ("Codepoints", _codepoints(glyph)),
+        ("UTF-8", _utf8_bytes(glyph)),
+    ]
+    return rows, variations, tone_support
 
 
-def _print_unicode_preview(glyph: str) -> None:
+def _unicode_fields(glyph: str) -> list[tuple[str, str]]:
     name = _safe_name(glyph) or "—"
     cat = unicodedata.category(glyph)
     cat_hr = CATEGORY_NAMES.get(cat, cat)
@@ -276,87 +259,319 @@ def _print_unicode_preview(glyph: str) -> None:
     mirrored = "Yes" if unicodedata.mirrored(glyph) else "No"
     decomp = unicodedata.decomposition(glyph) or "—"
 
-    tbl = Table(show_header=False, box=None, pad_edge=False)
-    tbl.add_row("Glyph", Text(f"{glyph}"))
-    tbl.add_row("Name", Text(name, style="bold"))
-    tbl.add_row("Category", f"{cat} ({cat_hr})")
-    tbl.add_row("Codepoints", _codepoints(glyph))
-    tbl.add_row("UTF-8", _utf8_bytes(glyph))
-    tbl.add_row("Combining", str(comb))
-    tbl.add_row("Bidi", bidi)
-    tbl.add_row("East Asian Width", eaw)
-    tbl.add_row("Mirrored", mirrored)
-    tbl.add_row("Decomposition", decomp)
+    rows = [
+        ("Glyph", glyph),
+        ("Name", name),
+        ("Category", f"{cat} ({cat_hr})"),
+        ("Codepoints", _codepoints(glyph)),
+        ("UTF-8", _utf8_bytes(glyph)),
+        ("Combining", str(comb)),
+        ("Bidi", bidi),
+        ("East Asian Width", eaw),
+        ("Mirrored", mirrored),
+        ("Decomposition", decomp),
+    ]
     if dec is not None:
-        tbl.add_row("Decimal", str(dec))
+        rows.append(("Decimal", str(dec)))
     if dig is not None:
-        tbl.add_row("Digit", str(dig))
+        rows.append(("Digit", str(dig)))
     if num is not None:
-        tbl.add_row("Numeric", str(num))
-    console.print(tbl)
+        rows.append(("Numeric", str(num)))
+    return rows
+
+
+# Plain ANSI preview: the per-keystroke path, with no Rich rendering pipeline.
+_BOLD = "\x1b[1m"
+_DIM = "\x1b[2m"
+_RESET = "\x1b[0m"
+
+
+def _ansi_table(rows: list[tuple[str, str]]) -> list[str]:
+    width = max(len(label) for label, _ in rows)
+    return [
+        f"{_BOLD}{label:<{width}}{_RESET}  {_BOLD}{value}{_RESET}"
+        if label == "Name"
+        else f"{_BOLD}{label:<{width}}{_RESET}  {value}"
+        for label, value in rows
+    ]
+
+
+def _render_preview(glyph: str) -> str:
+    """The preview as plain text with ANSI styling; no Rich import needed."""
+    fields = _emoji_fields(glyph)
+    if fields is None:
+        return "\n".join(_ansi_table(_unicode_fields(glyph))) + "\n"
+
+    rows, variations, tone_support = fields
+    lines = _ansi_table(rows)
+    if variations:
+        lines += ["", f"{_BOLD}Variations{_RESET}"]
+        lines += [f"{v}   {_codepoints(v)}" for v in variations[:8]]
+        if len(variations) > 8:
+            lines.append(f"… {len(variations) - 8} more")
+    if tone_support:
+        tones = [glyph + m for m in SKIN_MODS]
+        lines += [
+            "",
+            f"{_BOLD}Skin tones{_RESET}",
+            "  " + "  ".join(tones),
+            "  " + "  ".join(_codepoints(t) for t in tones),
+            f"{_DIM}Tip: After selecting the base emoji, append a skin tone modifier.{_RESET}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+# Rich preview, kept behind `preview --rich` for debugging.
+
+
+def _rich_table(rows: list[tuple[str, str]]):
+    from rich.table import Table
+    from rich.text import Text
+
+    tbl = Table(show_header=False, box=None, pad_edge=False)
+    for label, value in rows:
+        tbl.add_row(label, Text(value, style="bold" if label == "Name" else ""))
+    return tbl
+
+
+def _print_emoji_preview(console: Console, glyph: str) -> bool:
+    """
+    Try printing an emoji-focused preview.
+    Returns True if glyph looked up via emoji data, else False to fall back.
+    """
+    from rich.text import Text
+
+    fields = _emoji_fields(glyph)
+    if fields is None:
+        return False
+
+    rows, variations, tone_support = fields
+    console.print(_rich_table(rows))
+
+    # Variations
+    if variations:
+        console.print()
+        console.print(Text("Variations", style="bold"))
+        for v in variations[:8]:
+            console.print(f"{v}   {_codepoints(v)}")
+        if len(variations) > 8:
+            console.print(f"… {len(variations) - 8} more")
+
+    # Skin tones
+    if tone_support:
+        console.print()
+        console.print(Text("Skin tones", style="bold"))
+        tones = [glyph + m for m in SKIN_MODS]
+        console.print("  " + "  ".join(tones))
+        console.print("  " + "  ".join(_codepoints(t) for t in tones))
+        console.print(
+            Text(
+                "Tip: After selecting the base emoji, append a skin tone modifier.",
+                style="dim",
+            )
+        )
+
+    return True
 
 
-def _print_preview(glyph: str) -> None:
+def _print_unicode_preview(console: Console, glyph: str) -> None:
+    console.print(_rich_table(_unicode_fields(glyph)))
+
+
+def _print_preview(glyph: str, console: Console | None = None) -> None:
+    # Imported here: only the --rich debugging path needs rich at all.
+    from rich.console import Console
+
+    console = console or Console()
     # Prefer rich emoji preview; fall back to generic Unicode preview.
-    if not _print_emoji_preview(glyph):
-        _print_unicode_preview(glyph)
+    if not _print_emoji_preview(console, glyph):
+        _print_unicode_preview(console, glyph)
 
 
 def _build_rows(
     scope: Literal["emoji", "unicode", "both"],
     plane: Literal["bmp", "all"],
-) -> list[tuple[str, str]]:
-    rows: list[tuple[str, str]] = []
+    sort: bool = False,
+) -> Iterator[str]:
+    sources: list[Iterator[str]] = []
     if scope in ("unicode", "both"):
-        rows.extend(_unicode_rows(plane))
+        sources.append(_unicode_rows(plane))
     if scope in ("emoji", "both"):
-        rows.extend(_emoji_rows())
-    return rows
+        sources.append(_emoji_rows())
+    if sort:
+        # fzf ranks matches itself; sorting only orders the initial listing.
+        sources = [iter(sorted(rows, key=str.casefold)) for rows in sources]
+    return itertools.chain.from_iterable(sources)
+
+
+def _cache_path(
+    scope: Literal["emoji", "unicode", "both"],
+    plane: Literal["bmp", "all"],
+    sort: bool,
+) -> Path:
+    # Rows depend only on the emoji package, Python and its Unicode database.
+    try:
+        emoji_version = importlib.metadata.version("emoji")
+    except importlib.metadata.PackageNotFoundError:
+        emoji_version = "unknown"
+    py = f"{sys.version_info.major}.{sys.version_info.minor}"
+    ucd = unicodedata.unidata_version
+    order = "sorted" if sort else "unsorted"
+    key = f"rows-{scope}-{plane}-{order}-emoji{emoji_version}-py{py}-ucd{ucd}"
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "emoji-fzf" / f"{key}.tsv"
+
+
+def _input_chunks(
+    scope: Literal["emoji", "unicode", "both"],
+    plane: Literal["bmp", "all"],
+    sort: bool = False,
+) -> Iterator[bytes]:
+    """
+    The fzf input for `_build_rows` as UTF-8 "glyph<TAB>display" lines,
+    persisted under ~/.cache/emoji-fzf so warm runs are a single file read.
+    On a miss, lines are encoded and yielded in batches so fzf can start
+    indexing before the whole payload exists; the cache is only written once
+    the caller has consumed every batch.
+    """
+    path = _cache_path(scope, plane, sort)
+    try:
+        data = path.read_bytes()
+    except OSError:
+        pass
+    else:
+        yield data
+        return
+
+    rows = _build_rows(scope, plane, sort)
+    parts: list[bytes] = []
+    while batch := list(itertools.islice(rows, _CHUNK_ROWS)):
+        chunk = ("\n".join(batch) + "\n").encode("utf-8")
+        parts.append(chunk)
+        yield chunk
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(b"".join(parts))
+        tmp.replace(path)
+    except OSError:
+        pass  # caching is best-effort
+
+
+def _feed(stdin: IO[bytes], chunks: Iterable[bytes]) -> None:
+    try:
+        for chunk in chunks:
+            stdin.write(chunk)
+    except BrokenPipeError:
+        # fzf exited early: stop here rather than build the remaining rows
+        # just for the cache. It is written by the next run that finishes.
+        pass
+    try:
+        stdin.close()
+    except BrokenPipeError:
+        pass
 
 
-@app.command()
-def preview(
-    glyph: str = typer.Argument(..., help="(internal) glyph passed from fzf"),
-):
+def _serve_previews(server: socket.socket) -> None:
+    """
+    Answer "<glyph>\n" requests from fzf's preview command with the rendered
+    preview, so scrolling doesn't start a Python process per line.
+    """
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            return  # listening socket closed
+        with conn:
+            try:
+                conn.settimeout(5)
+                data = b""
+                while not data.endswith(b"\n"):
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                glyph = data.decode("utf-8", "replace").rstrip("\n")
+                text = _render_preview(glyph) if glyph else "(no selection)\n"
+                conn.sendall(text.encode("utf-8"))
+            except OSError:
+                pass  # fzf cancelled the preview mid-flight
+            except Exception as e:
+                # A bad glyph must not kill the thread: every later preview
+                # would hang on a socket nobody accepts on.
+                try:
+                    conn.sendall(f"preview failed: {e}\n".encode("utf-8"))
+                except OSError:
+                    pass
+
+
+def _preview_client(sock_path: str) -> str | None:
+    """
+    A shell command piping fzf's {1} to the preview socket, or None if no
+    installed client can reach it. Each candidate is tried against the live
+    server: netcat-traditional and busybox nc have no `-U`.
+    """
+    candidates: list[list[str]] = []
+    if nc := shutil.which("nc"):
+        candidates.append([nc, "-U", sock_path])
+    if socat := shutil.which("socat"):
+        candidates.append([socat, "-", f"UNIX-CONNECT:{sock_path}"])
+    for argv in candidates:
+        try:
+            probe = subprocess.run(argv, input=b"\n", capture_output=True, timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if probe.stdout.startswith(b"(no selection)"):
+            return f'printf "%s\\n" {{1}} | {shlex.join(argv)}'
+    return None
+
+
+def preview(glyph: str, rich: bool = False) -> None:
     """Internal command used by fzf: `emoji_fzf.py preview {1}`"""
     if not glyph:
-        console.print("(no selection)")
-        raise typer.Exit(0)
-    _print_preview(glyph)
+        print("(no selection)")
+    elif rich:
+        _print_preview(glyph)
+    else:
+        sys.stdout.write(_render_preview(glyph))
 
 
-@app.command()
 def pick(
-    query: str = typer.Option("", "--query", "-q", help="Initial fzf query."),
-    height: int = typer.Option(90, "--height", help="fzf height percentage (1-100)."),
-    preview_width: int = typer.Option(
-        60, "--preview-width", help="Preview width percentage (1-100)."
-    ),
-    multi: bool = typer.Option(True, "--multi/--no-multi", help="Enable multi-select."),
-    scope: Literal["emoji", "unicode", "both"] = typer.Option(
-        "both",
-        "--scope",
-        help="Search set: 'emoji' (fast), 'unicode' (all assigned codepoints), or 'both'.",
-    ),
-    plane: Literal["bmp", "all"] = typer.Option(
-        "all",
-        "--plane",
-        help="For scope 'unicode' or 'both': limit to BMP (U+0000–U+FFFF) or include ALL planes.",
-    ),
-):
+    query: str = "",
+    height: int = 90,
+    preview_width: int = 60,
+    multi: bool = True,
+    scope: Literal["emoji", "unicode", "both"] = "both",
+    plane: Literal["bmp", "all"] = "all",
+    sort: bool = False,
+) -> None:
     """
-    Open fzf to search emojis and/or all Unicode characters with a Rich preview.
+    Open fzf to search emojis and/or all Unicode characters with a preview pane.
     Prints chosen glyph(s) to stdout.
     """
     fzf = _ensure_fzf()
-    rows = _build_rows(scope, plane)
-
-    delimiter = "\t"
-    input_text = "\n".join(f"{g}{delimiter}{d}" for g, d in rows)
 
-    this = os.path.abspath(sys.argv[0])
-    py = shlex.quote(sys.executable)
-    preview_cmd = f"{py} {shlex.quote(this)} preview {{1}}"
+    # Serve previews from this process over a unix socket when `nc -U` or
+    # socat can reach it; otherwise fzf re-runs this script for every preview.
+    server: socket.socket | None = None
+    sock_dir = None
+    preview_cmd = None
+    if hasattr(socket, "AF_UNIX") and (shutil.which("nc") or shutil.which("socat")):
+        sock_dir = tempfile.mkdtemp(prefix="emoji-fzf-")
+        sock_path = os.path.join(sock_dir, "preview.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(sock_path)
+        server.listen()
+        threading.Thread(target=_serve_previews, args=(server,), daemon=True).start()
+        preview_cmd = _preview_client(sock_path)
+        if preview_cmd is None:
+            server.close()
+            shutil.rmtree(sock_dir, ignore_errors=True)
+            server = sock_dir = None
+    if preview_cmd is None:
+        this = os.path.abspath(sys.argv[0])
+        py = shlex.quote(sys.executable)
+        preview_cmd = f"{py} {shlex.quote(this)} preview {{1}}"
 
     prompt = {
         "emoji": "emoji> ",
@@ -370,7 +585,7 @@ def pick(
         "--reverse",
         f"--prompt={prompt}",
         "--delimiter",
-        delimiter,
+        DELIMITER,
         "--with-nth=2..",
         "--preview",
         preview_cmd,
@@ -385,28 +600,111 @@ def pick(
     if query:
         opts.extend(["--query", query])
 
-    proc = subprocess.run(
-        [fzf, *opts],
-        input=input_text,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+    try:
+        with subprocess.Popen(
+            [fzf, *opts],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as proc:
+            _feed(proc.stdin, _input_chunks(scope, plane, sort))
+            stdout = proc.stdout.read()
+    finally:
+        if server is not None:
+            server.close()
+        if sock_dir is not None:
+            shutil.rmtree(sock_dir, ignore_errors=True)
+    if proc.returncode != 0 or not stdout.strip():
+        return
+
+    # Stay in bytes: the glyph is everything before the first tab on each line.
+    delimiter = DELIMITER.encode()
+    lines = [line for line in stdout.splitlines() if line.strip()]
+    out = [g for g in (line.split(delimiter, 1)[0] for line in lines) if g]
+    sys.stdout.buffer.write(b"\n".join(out) + b"\n")
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(
+        prog="emoji-fzf",
+        description="Fuzzy-search emojis or all Unicode characters with a preview pane.",
     )
+    sub = parser.add_subparsers(dest="command", required=True)
 
-    if proc.returncode != 0 or not proc.stdout.strip():
-        raise typer.Exit(0)
+    p_preview = sub.add_parser(
+        "preview", help="Internal command used by fzf: `emoji_fzf.py preview {1}`"
+    )
+    p_preview.add_argument("glyph", help="(internal) glyph passed from fzf")
+    p_preview.add_argument(
+        "--rich", action="store_true", help="Render the preview with Rich (debugging)."
+    )
 
-    out: list[str] = []
-    for line in proc.stdout.splitlines():
-        if not line.strip():
-            continue
-        glyph = line.split(delimiter, 1)[0]
-        if glyph:
-            out.append(glyph)
+    p_pick = sub.add_parser(
+        "pick",
+        help="Open fzf to search emojis and/or all Unicode characters.",
+        description=(
+            "Open fzf to search emojis and/or all Unicode characters with a preview "
+            "pane. Prints chosen glyph(s) to stdout."
+        ),
+    )
+    p_pick.add_argument("--query", "-q", default="", help="Initial fzf query.")
+    p_pick.add_argument(
+        "--height", type=int, default=90, help="fzf height percentage (1-100)."
+    )
+    p_pick.add_argument(
+        "--preview-width",
+        type=int,
+        default=60,
+        help="Preview width percentage (1-100).",
+    )
+    p_pick.add_argument(
+        "--multi",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Enable multi-select.",
+    )
+    p_pick.add_argument(
+        "--scope",
+        choices=["emoji", "unicode", "both"],
+        default="both",
+        help="Search set: 'emoji' (fast), 'unicode' (all assigned codepoints), or 'both'.",
+    )
+    p_pick.add_argument(
+        "--plane",
+        choices=["bmp", "all"],
+        default="all",
+        help="For scope 'unicode' or 'both': limit to BMP (U+0000–U+FFFF) or include ALL planes.",
+    )
+    p_pick.add_argument(
+        "--sort",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Pre-sort the listing alphabetically (fzf still ranks matches).",
+    )
 
-    sys.stdout.write("\n".join(out))
-    sys.stdout.write("\n")
+    args = parser.parse_args()
+    if args.command == "preview":
+        preview(args.glyph, args.rich)
+    else:
+        pick(
+            args.query,
+            args.height,
+            args.preview_width,
+            args.multi,
+            args.scope,
+            args.plane,
+            args.sort,
+        )
 
 
 if __name__ == "__main__":
-    app()
+    # fzf runs `preview` on every selection change: skip argument parsing there.
+    # Anything flag-like (-h, --rich) still goes through argparse.
+    if (
+        sys.argv[1:2] == ["preview"]
+        and len(sys.argv) == 3
+        and not sys.argv[2].startswith("-")
+    ):
+        preview(sys.argv[2])
+    else:
+        _cli()
@@ -3,7 +3,7 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
-#   "httpx>=0.27.0",
+#   "httpx[http2]>=0.27.0",
 #   "typer>=0.12.5",
 #   "rich>=13.7.1",
 #   "platformdirs>=4.2.2",
@@ -21,6 +21,9 @@ uv run gh-release.py --repo cli/cli --list
 # Download assets that match your current platform only
 uv run gh-release.py --repo sharkdp/bat --match-platform --dir ./bin
 
+# ...and check them against the release's published SHA-256 sums
+uv run gh-release.py --repo sharkdp/bat --match-platform --verify
+
 # Download all release assets for a specific tag
 uv run gh-release.py --repo BurntSushi/ripgrep --tag 14.1.0
 
@@ -32,15 +35,20 @@ uv run gh-release.py --repo junegunn/fzf --regex "(linux|darwin).*(amd64|arm64)"
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
+import json
+import mmap
 import os
 import platform
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional
 
 import httpx
+import platformdirs
 import typer
 from rich.console import Console
 from rich.progress import (
@@ -58,6 +66,16 @@ console = Console()
 
 GITHUB_API = "https://api.github.com"
 
+# Coalesce progress-bar updates: every 256 KiB or 100 ms, whichever is first.
+PROGRESS_FLUSH_BYTES = 256 * 1024
+PROGRESS_FLUSH_SECS = 0.1
+
+# Batch network chunks into 1 MiB writes, done off the event loop.
+WRITE_BUFFER = 1024 * 1024
+
+# Files at least this big are hashed through mmap instead of read() copies.
+MMAP_MIN_SIZE = 64 * 1024 * 1024
+
 
 # ----------------------------- Utility helpers ----------------------------- #
 
@@ -76,12 +94,21 @@ def clamp(n: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, n))
 
 
-def sha256sum(path: Path) -> str:
-    h = hashlib.sha256()
+def update_from_file(hasher: hashlib._Hash, path: Path) -> None:
     with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            # OpenSSL reads the mapped pages directly; nothing is copied.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                hasher.update(mm)
+            return
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+            hasher.update(chunk)
+
+
+def cache_dir() -> Path:
+    return Path(platformdirs.user_cache_dir("gh-release"))
 
 
 def get_token() -> Optional[str]:
@@ -125,7 +152,8 @@ ARCH_MAP = {
 }
 
 
-def current_platform_terms() -> list[str]:
+@functools.lru_cache(maxsize=1)
+def current_platform_terms() -> tuple[str, ...]:
     sys = platform.system().lower()
     mach = ARCH_MAP.get(platform.machine().lower(), platform.machine().lower())
     terms: list[str] = []
@@ -155,7 +183,7 @@ def current_platform_terms() -> list[str]:
     else:
         terms += ["linux.tar.gz", "linux.tgz", "unknown-linux-gnu", "musl", "gnu"]
 
-    return list(dict.fromkeys(terms))  # dedupe while preserving order
+    return tuple(dict.fromkeys(terms))  # dedupe while preserving order
 
 
 # --------------------------- Checksum recognition --------------------------- #
@@ -166,10 +194,19 @@ CHECKSUM_BUNDLE_RE = re.compile(
 )
 
 
+# 'HEX  filename' / 'HEX *filename', or else 'filename: HEX' / 'filename=HEX'
+CHECKSUM_LINE_RE = re.compile(
+    r"^(?:([0-9a-fA-F]{64})\s+\*?(.*)|(.*?)[=:]\s*([0-9a-fA-F]{64}))$"
+)
+
+
+ARCHIVE_EXT_RE = re.compile(r"\.(?:tar\.gz|tgz|zip|tar\.xz|txz|tar\.bz2|tbz2)\Z")
+
+
 def strip_archive_ext(name: str) -> str:
-    for ext in [".tar.gz", ".tgz", ".zip", ".tar.xz", ".txz", ".tar.bz2", ".tbz2"]:
-        if name.endswith(ext):
-            return name[: -len(ext)]
+    m = ARCHIVE_EXT_RE.search(name)
+    if m:
+        return name[: m.start()]
     return name.rsplit(".", 1)[0] if "." in name else name
 
 
@@ -177,6 +214,10 @@ def is_checksum_bundle(name: str) -> bool:
     return bool(CHECKSUM_BUNDLE_RE.match(name))
 
 
+def is_checksum_file(name: str) -> bool:
+    return is_checksum_bundle(name) or name.endswith((".sha256", ".sha256sum"))
+
+
 def parse_checksum_lines(text: str) -> dict[str, str]:
     """
     Parses common checksum formats:
@@ -189,15 +230,14 @@ def parse_checksum_lines(text: str) -> dict[str, str]:
         s = line.strip()
         if not s or s.startswith("#"):
             continue
-        # formats
-        m = re.match(r"^([0-9a-fA-F]{64})\s+\*?(.*)$", s)
-        if m:
-            checksums[m.group(2).strip()] = m.group(1).lower()
-            continue
-        m = re.match(r"^(.*?)[=:]\s*([0-9a-fA-F]{64})$", s)
-        if m:
-            checksums[m.group(1).strip()] = m.group(2).lower()
+        m = CHECKSUM_LINE_RE.match(s)
+        if m is None:
             continue
+        digest, name, alt_name, alt_digest = m.groups()
+        if digest is not None:
+            checksums[name.strip()] = digest.lower()
+        else:
+            checksums[alt_name.strip()] = alt_digest.lower()
     return checksums
 
 
@@ -229,9 +269,29 @@ class GitHub:
             url = f"{GITHUB_API}/repos/{repo}/releases/tags/{tag}"
         else:
             url = f"{GITHUB_API}/repos/{repo}/releases/latest"
-        r = self._client.get(url)
-        r.raise_for_status()
-        data = r.json()
+
+        # Replay the last response's ETag; a 304 costs no body or rate limit.
+        key = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{repo}@{tag or 'latest'}")
+        body_path = cache_dir() / f"{key}.json"
+        etag_path = cache_dir() / f"{key}.etag"
+        headers = {}
+        if body_path.exists() and etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text()
+
+        r = self._client.get(url, headers=headers)
+        if r.status_code == 304:
+            data = json.loads(body_path.read_bytes())
+        else:
+            r.raise_for_status()
+            data = r.json()
+            etag = r.headers.get("ETag")
+            if etag:
+                try:
+                    cache_dir().mkdir(parents=True, exist_ok=True)
+                    body_path.write_bytes(r.content)
+                    etag_path.write_text(etag)
+                except OSError:
+                    pass  # caching is best-effort
         assets = [
             Asset(
                 name=a["name"],
@@ -262,22 +322,82 @@ async def download_one(
     etag: str | None = None,
     progress: Optional[Progress] = None,
     task_id: Optional[int] = None,
+    hasher: Optional[hashlib._Hash] = None,
+    expected_digest: str | None = None,
 ) -> None:
     """
     Resumable downloader: appends to *.part and renames on completion.
-    Uses Range + If-Range when possible.
+    Uses Range + If-Range when possible. If `hasher` is given, it is fed
+    every byte of the file as it streams in; with `expected_digest` too, a
+    .part whose hash doesn't match is discarded instead of renamed.
     """
     part = dest.with_suffix(dest.suffix + ".part")
-    headers = {}
+    # Ask for the raw bytes so sizes and Range offsets match the asset.
+    headers = {"Accept-Encoding": "identity"}
     pos = 0
     if part.exists():
         pos = part.stat().st_size
+
+    def promote() -> None:
+        # Never rename a .part that fails its checksum: the next run must
+        # fetch it again rather than find a "complete" file in place.
+        if expected_digest and hasher is not None:
+            if hasher.hexdigest() != expected_digest.lower():
+                part.unlink(missing_ok=True)
+                return
+        part.rename(dest)
+
+    # Already downloaded (e.g. a re-run): skip the request entirely. Only a
+    # finished dest counts; a .part's size alone doesn't prove its contents.
+    if expected_size and dest.exists() and dest.stat().st_size == expected_size:
+        if hasher is not None:
+            await asyncio.to_thread(update_from_file, hasher, dest)
+        if progress and task_id is not None:
+            progress.update(task_id, total=expected_size, completed=expected_size)
+        return
+
+    if pos > 0:
         headers["Range"] = f"bytes={pos}-"
         if etag:
             headers["If-Range"] = etag
 
     async with client.stream("GET", url, headers=headers, follow_redirects=True) as r:
+        if pos > 0 and r.status_code == 416:
+            # The range starts at EOF: the .part may already be complete, but
+            # only a checksum can confirm it (an older run may have left a
+            # zero-filled, preallocated file of exactly this size).
+            if pos == expected_size and expected_digest and hasher is not None:
+                # Check a copy so a bad .part leaves `hasher` clean for the
+                # refetch below.
+                check = hasher.copy()
+                await asyncio.to_thread(update_from_file, check, part)
+                if check.hexdigest() == expected_digest.lower():
+                    await asyncio.to_thread(update_from_file, hasher, part)
+                    part.rename(dest)
+                    return
+            # Unverifiable, corrupt or oversized .part: start over. Free
+            # this connection first; the pool is sized to `parallel`.
+            await r.aclose()
+            part.unlink()
+            return await download_one(
+                client,
+                url,
+                dest,
+                expected_size,
+                etag,
+                progress,
+                task_id,
+                hasher,
+                expected_digest,
+            )
         r.raise_for_status()
+        if pos > 0 and r.status_code != 206:
+            # Range ignored (or If-Range mismatched): this is the whole file,
+            # so overwrite rather than append it.
+            pos = 0
+        elif pos > 0 and hasher is not None:
+            # Seed with the bytes already on disk before the rest streams in.
+            await asyncio.to_thread(update_from_file, hasher, part)
         mode = "ab" if pos > 0 else "wb"
         total = None
         # compute total if known (for progress bar)
@@ -289,113 +409,198 @@ async def download_one(
         if progress and task_id is not None and total is not None:
             progress.update(task_id, total=total, completed=pos)
 
+        track = progress is not None and task_id is not None
+        pending = 0
+        last_flush = time.monotonic()
+        buf = bytearray()
         with open(part, mode) as f:
-            async for chunk in r.aiter_bytes():
-                f.write(chunk)
-                if progress and task_id is not None:
-                    progress.update(task_id, advance=len(chunk))
-
-    # Verify size if available
-    if expected_size is not None and part.stat().st_size != expected_size:
-        # Some servers gzip on the fly; don't hard fail here. We'll rename anyway.
-        pass
+            fd = f.fileno()
+            # No up-front fallocate: the .part must only ever hold bytes that
+            # actually arrived, since its size is the resume offset.
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            def write(data: bytearray) -> None:
+                f.write(data)
+                # hashlib drops the GIL on large updates, so concurrent
+                # downloads hash on separate cores.
+                if hasher is not None:
+                    hasher.update(data)
 
-    part.rename(dest)
+            async for chunk in r.aiter_bytes():
+                buf += chunk
+                if len(buf) >= WRITE_BUFFER:
+                    # A blocking write here would stall every other download.
+                    await asyncio.to_thread(write, buf)
+                    buf.clear()
+                if track:
+                    pending += len(chunk)
+                    now = time.monotonic()
+                    if (
+                        pending >= PROGRESS_FLUSH_BYTES
+                        or now - last_flush > PROGRESS_FLUSH_SECS
+                    ):
+                        progress.update(task_id, advance=pending)
+                        pending = 0
+                        last_flush = now
+            if buf:
+                await asyncio.to_thread(write, buf)
+            if hasattr(os, "posix_fadvise"):
+                # Release assets are usually unpacked once: keep them out of
+                # the page cache.
+                f.flush()
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        if track and pending:
+            progress.update(task_id, advance=pending)
+
+    promote()
 
 
 async def download_many(
     assets: list[Asset],
     dest_dir: Path,
+    parallel: int = 4,
+    checksum_assets: list[Asset] | None = None,
+    keep_checksums: bool = False,
 ) -> None:
+    """
+    Download `assets` into `dest_dir`, verifying them against any hashes
+    found in `checksum_assets` (fetched first, in memory).
+    """
     dest_dir.mkdir(parents=True, exist_ok=True)
-
-    # First, separate checksum assets vs normal assets so we can download checksums first
+    data_assets = assets
+
+    # Bundles may cover anything, but a per-file checksum is only worth
+    # fetching if its asset is being downloaded.
+    wanted = {
+        n + ext
+        for a in data_assets
+        for n in (a.name, strip_archive_ext(a.name))
+        for ext in (".sha256", ".sha256sum")
+    }
     checksum_assets = [
         a
-        for a in assets
-        if is_checksum_bundle(a.name) or a.name.endswith((".sha256", ".sha256sum"))
+        for a in checksum_assets or []
+        if is_checksum_bundle(a.name) or a.name in wanted
     ]
-    data_assets = [a for a in assets if a not in checksum_assets]
 
-    async with httpx.AsyncClient(timeout=60) as client:
+    # One pooled HTTP/2 client for both phases: release assets all come from
+    # the same CDN host, so streams share a single TLS session.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(
+            max_connections=parallel, max_keepalive_connections=parallel
+        ),
+    )
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+    # At most `parallel` downloads (and open .part files) at any one time.
+    sem = asyncio.Semaphore(parallel)
+
+    async def fetch(
+        a: Asset,
+        t: int,
+        hasher: Optional[hashlib._Hash] = None,
+        expected: str | None = None,
+    ) -> None:
+        async with sem:
+            await download_one(
+                client,
+                a.url,
+                dest_dir / a.name,
+                a.size,
+                None,
+                progress,
+                t,
+                hasher,
+                expected,
+            )
+
+    # Checksum files are tiny: parse them straight from memory.
+    checksum_texts: dict[str, str] = {}
+    checksum_errors: dict[str, str] = {}
+
+    # Failures are collected rather than raised, which the TaskGroup would
+    # surface as a raw ExceptionGroup traceback.
+    async def fetch_checksum(a: Asset) -> None:
+        async with sem:
+            try:
+                r = await client.get(a.url, follow_redirects=True)
+            except httpx.HTTPError as e:
+                checksum_errors[a.name] = f"{type(e).__name__}: {e}"
+                return
+        if r.is_error:
+            checksum_errors[a.name] = f"HTTP {r.status_code} {r.reason_phrase}"
+            return
+        checksum_texts[a.name] = r.text
+        if keep_checksums:
+            (dest_dir / a.name).write_bytes(r.content)
+
+    async with httpx.AsyncClient(transport=transport, timeout=60) as client:
         # Download checksums first
-        with Progress(
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(),
-            DownloadColumn(),
-            TransferSpeedColumn(),
-            TimeRemainingColumn(),
-            transient=True,
-            console=console,
-        ) as progress:
-            tasks = []
+        async with asyncio.TaskGroup() as tg:
             for a in checksum_assets:
-                dest = dest_dir / a.name
-                t = progress.add_task(f"Checksum {a.name}", total=a.size or None)
-                tasks.append(
-                    download_one(client, a.url, dest, a.size, None, progress, t)
+                tg.create_task(fetch_checksum(a))
+        if checksum_errors:
+            for name, err in checksum_errors.items():
+                console.print(
+                    f"[red]Error:[/red] Couldn't fetch checksum file {name}: {err}"
                 )
-            await asyncio.gather(*tasks)
+            raise SystemExit(1)
 
         # Build checksum map (name -> hash)
         checksum_map: dict[str, str] = {}
         for a in checksum_assets:
-            p = dest_dir / a.name
-            if not p.exists():
-                continue
+            text = checksum_texts[a.name]
             if a.name.endswith((".sha256", ".sha256sum")):
                 try:
                     checksum_map[strip_archive_ext(a.name)] = (
-                        p.read_text().strip().split()[0]
+                        text.strip().split()[0]
                     ).lower()
                 except Exception:
                     pass
             elif is_checksum_bundle(a.name):
-                try:
-                    parsed = parse_checksum_lines(p.read_text())
-                    checksum_map.update(parsed)
-                except Exception:
-                    pass
-
-        # Download data assets
-        with Progress(
-            TextColumn("[bold green]{task.description}"),
-            BarColumn(),
-            DownloadColumn(),
-            TransferSpeedColumn(),
-            TimeRemainingColumn(),
-            transient=False,
-            console=console,
-        ) as progress:
-            tasks = []
-            for a in data_assets:
-                dest = dest_dir / a.name
-                t = progress.add_task(a.name, total=a.size or None)
-                tasks.append(
-                    download_one(client, a.url, dest, a.size, None, progress, t)
-                )
-            await asyncio.gather(*tasks)
+                checksum_map.update(parse_checksum_lines(text))
+
+        with progress:
+            # Download data assets, hashing as they stream so verification needs
+            # no second read.
+            hashers: dict[str, tuple[str, hashlib._Hash]] = {}
+            async with asyncio.TaskGroup() as tg:
+                for a in data_assets:
+                    t = progress.add_task(f"[bold green]{a.name}", total=a.size or None)
+                    # direct match, then base-name match (a selected
+                    # checksum file's base name is the asset it covers)
+                    expected = checksum_map.get(a.name)
+                    if not expected and not is_checksum_file(a.name):
+                        expected = checksum_map.get(strip_archive_ext(a.name))
+                    hasher = hashlib.sha256() if expected else None
+                    if hasher is not None:
+                        hashers[a.name] = (expected, hasher)
+                    tg.create_task(fetch(a, t, hasher, expected))
 
     # Optional verification
-    if checksum_map:
+    if hashers:
         failures = 0
         for a in data_assets:
-            p = dest_dir / a.name
-            if not p.exists():
+            if a.name not in hashers:
                 continue
-            # direct match
-            expected = checksum_map.get(a.name)
-            # base-name match
-            expected = expected or checksum_map.get(strip_archive_ext(a.name))
-            if expected:
-                actual = sha256sum(p)
-                if actual != expected.lower():
-                    failures += 1
-                    console.print(
-                        f"[red]Checksum FAILED[/red] {a.name} expected {expected} got {actual}"
-                    )
-                else:
-                    console.print(f"[green]Checksum OK[/green] {a.name}")
+            expected, hasher = hashers[a.name]
+            actual = hasher.hexdigest()
+            if actual != expected.lower():
+                failures += 1
+                console.print(
+                    f"[red]Checksum FAILED[/red] {a.name} expected {expected} got {actual}"
+                )
+            else:
+                console.print(f"[green]Checksum OK[/green] {a.name}")
         if failures:
             console.print(
                 "[red]Error:[/red] Checksum verification failed after download."
@@ -413,27 +618,31 @@ def filter_assets(
     regex: str | None = None,
     match_platform: bool = False,
 ) -> list[Asset]:
-    items = list(assets)
+    # Lowercase every name once, not once per comparison.
+    items = [(a, a.name.lower()) for a in assets]
 
-    def contains_any(name: str, needles: list[str]) -> bool:
-        lname = name.lower()
-        return any(n.lower() in lname for n in needles)
+    def any_of(needles: Iterable[str]) -> re.Pattern[str]:
+        # One alternation scans each name once instead of once per needle.
+        lowered = dict.fromkeys(n.lower() for n in needles)
+        return re.compile("|".join(re.escape(n) for n in lowered))
 
     if match_platform:
-        terms = current_platform_terms()
-        items = [a for a in items if contains_any(a.name, terms)]
+        terms = any_of(current_platform_terms())
+        items = [(a, ln) for a, ln in items if terms.search(ln)]
 
     if include:
-        items = [a for a in items if contains_any(a.name, include)]
+        needles = any_of(include)
+        items = [(a, ln) for a, ln in items if needles.search(ln)]
 
     if exclude:
-        items = [a for a in items if not contains_any(a.name, exclude)]
+        needles = any_of(exclude)
+        items = [(a, ln) for a, ln in items if not needles.search(ln)]
 
     if regex:
         r = re.compile(regex, re.IGNORECASE)
-        items = [a for a in items if r.search(a.name)]
+        items = [(a, ln) for a, ln in items if r.search(a.name)]
 
-    return items
+    return [a for a, _ in items]
 
 
 # ---------------------------------- CLI ---------------------------------- #
@@ -461,6 +670,13 @@ def main(
     regex: Optional[str] = typer.Option(
         None, help="Regex filter applied to asset names"
     ),
+    parallel: int = typer.Option(4, help="Maximum concurrent connections"),
+    verify: bool = typer.Option(
+        False, "--verify", help="Verify downloads against the release's checksums"
+    ),
+    keep_checksums: bool = typer.Option(
+        False, help="With --verify, also save the checksum files used"
+    ),
 ):
     """
     Download assets from a GitHub release.
@@ -509,7 +725,18 @@ def main(
 
     # Proceed with download
     console.print(f"Downloading {len(selected)} asset(s) to [bold]{dir}[/bold] ...")
-    asyncio.run(download_many(selected, dir))
+    # Checksum files are looked up in the whole release, since filters such
+    # as --match-platform usually drop them.
+    checksum_assets = [a for a in info.assets if is_checksum_file(a.name)]
+    asyncio.run(
+        download_many(
+            selected,
+            dir,
+            clamp(parallel, 1, 32),
+            checksum_assets if verify else None,
+            keep_checksums,
+        )
+    )
 
     console.print("[green]Done.[/green]")
 
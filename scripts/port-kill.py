@@ -37,7 +37,9 @@ Examples
 from __future__ import annotations
 
 import argparse
+import csv
 import dataclasses as dc
+import functools
 import os
 import platform
 import re
@@ -45,6 +47,7 @@ import shlex
 import signal
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 import typer
@@ -53,10 +56,17 @@ from rich.panel import Panel
 
 console = Console()
 
+_SYSTEM = platform.system().lower()
+
+# Parsers run these per output line: compile once.
+_RE_PORT_SUFFIX = re.compile(r":(\d+)$")
+_RE_LSOF_NAME = re.compile(r":(\d+) \(LISTEN\)$")
+_RE_PID_PROG = re.compile(r"(\d+)/")
+
 # --------------------------- Data model ---------------------------
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class Listener:
     pid: int
     port: int
@@ -64,6 +74,8 @@ class Listener:
     process: str = "?"
     user: str = "?"
     cmd: str = "?"
+    # Lowercased "process\ncmd", filled in by discover_listeners for --filter.
+    search: str = dc.field(default="", repr=False, compare=False)
 
     def display_row(self) -> str:
         return f"{self.port:>5}  {self.pid:>7}  {self.process:<20}  {self.cmd}"
@@ -93,16 +105,26 @@ def run(cmd: List[str]) -> Tuple[int, str, str]:
 
 
 def discover_listeners() -> List[Listener]:
-    system = platform.system().lower()
+    # Process info is cached per pid; start fresh in case pids were reused.
+    cmdline_of_pid.cache_clear()
+    system = _SYSTEM
     if system == "darwin":
-        return discover_macos()
+        items = discover_macos()
     elif system == "linux":
-        return discover_linux()
+        items = discover_linux()
     elif system == "windows":
-        return discover_windows()
+        items = discover_windows()
     else:
         print(f"Unsupported OS: {system}", file=sys.stderr)
         return []
+    for it in items:
+        it.search = f"{it.process}\n{it.cmd}".lower()
+    return items
+
+
+def index_listeners(items: List[Listener]) -> dict[Tuple[int, int], Listener]:
+    # Used to map a picked fzf line back to its Listener.
+    return {(it.pid, it.port): it for it in items}
 
 
 def discover_macos() -> List[Listener]:
@@ -117,12 +139,12 @@ def discover_macos() -> List[Listener]:
             return []
     listeners: List[Listener] = []
     for line in out.splitlines()[1:]:  # skip header
-        parts = re.split(r"\s+", line, maxsplit=8)
+        parts = line.split(None, 8)
         if len(parts) < 9:
             continue
         cmd, pid, user, fd, _type, _device, _off, _node, name = parts
         # name looks like: *:3000 (LISTEN) or 127.0.0.1:8000 (LISTEN)
-        m = re.search(r":(\d+) \(LISTEN\)$", name)
+        m = _RE_LSOF_NAME.search(name)
         if not m:
             continue
         port = int(m.group(1))
@@ -133,14 +155,17 @@ def discover_macos() -> List[Listener]:
                 proto="tcp",
                 process=cmd,
                 user=user,
-                cmd=cmdline_of_pid(int(pid)),
             )
         )
-    return dedupe(listeners)
+    return with_cmdlines(dedupe(listeners))
 
 
 def discover_linux() -> List[Listener]:
-    # Prefer ss; it's standard on modern distros.
+    # Read the kernel's socket tables directly when /proc allows it.
+    listeners = read_proc_net_tcp()
+    if listeners is not None:
+        return listeners
+    # Otherwise prefer ss; it's standard on modern distros.
     # ss -H -ltnp  (Headerless, Listening, TCP, Numeric, show PIDs)
     if which("ss"):
         code, out, err = run(["ss", "-H", "-ltnp"])
@@ -155,42 +180,105 @@ def discover_linux() -> List[Listener]:
     return []
 
 
+def read_proc_net_tcp() -> Optional[List[Listener]]:
+    """
+    Listeners from /proc/net/tcp{,6}, matched to owning processes through
+    the socket inodes in /proc/<pid>/fd. Returns None if /proc/net is
+    unavailable so the caller can fall back to ss/netstat.
+    """
+    # inode -> port for every listening socket
+    ports: dict[int, int] = {}
+    readable = False
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path, "rb") as f:
+                lines = f.read().splitlines()[1:]  # skip header
+        except OSError:
+            continue  # e.g. IPv6 disabled
+        readable = True
+        for line in lines:
+            # sl local_address rem_address st ... uid timeout inode
+            cols = line.split()
+            if len(cols) < 10 or cols[3] != b"0A":  # 0A == TCP_LISTEN
+                continue
+            inode = int(cols[9])
+            if inode:
+                ports[inode] = int(cols[1].rsplit(b":", 1)[1], 16)
+    if not readable:
+        return None
+
+    listeners: List[Listener] = []
+    if not ports:
+        return listeners
+    with os.scandir("/proc") as procs:
+        for proc in procs:
+            if not proc.name.isdigit():
+                continue
+            pid = int(proc.name)
+            found = []
+            try:
+                with os.scandir(f"/proc/{pid}/fd") as fds:
+                    for fd in fds:
+                        try:
+                            target = os.readlink(fd.path)
+                        except OSError:
+                            continue
+                        if target.startswith("socket:["):
+                            port = ports.get(int(target[8:-1]))
+                            if port is not None:
+                                found.append(port)
+            except OSError:
+                continue  # exited, or owned by another user
+            if not found:
+                continue
+            try:
+                with open(f"/proc/{pid}/comm") as f:
+                    proc_name = f.read().strip() or "?"
+            except OSError:
+                proc_name = "?"
+            for port in found:
+                listeners.append(
+                    Listener(pid=pid, port=port, proto="tcp", process=proc_name)
+                )
+    return with_cmdlines(dedupe(listeners))
+
+
 def parse_ss(out: str) -> List[Listener]:
     listeners: List[Listener] = []
     for line in out.splitlines():
         # Example: LISTEN 0 128 127.0.0.1:8000 *:* users:("python3",pid=1234,fd=7)
-        cols = re.split(r"\s+", line)
+        cols = line.split()
         if len(cols) < 5:
             continue
-        local = cols[3]
-        mport = re.search(r":(\d+)$", local)
-        if not mport:
+        port_str = cols[3].rpartition(":")[2]
+        if not port_str.isdigit():
+            continue  # e.g. *:*
+        port = int(port_str)
+        # Could be multiple entries; pick the first: users:(("name",pid=N,fd=M),...)
+        i = line.find('users:(("')
+        if i < 0:
+            continue
+        i += 9
+        j = line.find('",pid=', i)
+        if j <= i:
             continue
-        port = int(mport.group(1))
-        mproc = re.search(r"users:\(([^\)]+)\)", line)
-        proc_name = "?"
-        pid = -1
-        if mproc:
-            # Could be multiple entries; pick first pid
-            first = mproc.group(1)
-            mpid = re.search(r"pid=(\d+)", first)
-            mname = re.search(r"\"([^\"]+)\"", first)
-            if mpid:
-                pid = int(mpid.group(1))
-            if mname:
-                proc_name = mname.group(1)
-        if pid == -1:
+        proc_name = line[i:j]
+        j += 6
+        k = j
+        while k < len(line) and line[k].isdigit():
+            k += 1
+        if k == j:
             continue
+        pid = int(line[j:k])
         listeners.append(
             Listener(
                 pid=pid,
                 port=port,
                 proto="tcp",
                 process=proc_name,
-                cmd=cmdline_of_pid(pid),
             )
         )
-    return dedupe(listeners)
+    return with_cmdlines(dedupe(listeners))
 
 
 def parse_netstat_linux(out: str) -> List[Listener]:
@@ -198,16 +286,16 @@ def parse_netstat_linux(out: str) -> List[Listener]:
     for line in out.splitlines():
         if not line.startswith("tcp"):
             continue
-        parts = re.split(r"\s+", line)
+        parts = line.split()
         if len(parts) < 7:
             continue
         local = parts[3]
         pid_prog = parts[-1]  # e.g., 1234/python3 or -
-        m = re.search(r":(\d+)$", local)
+        m = _RE_PORT_SUFFIX.search(local)
         if not m:
             continue
         port = int(m.group(1))
-        mpid = re.match(r"(\d+)/", pid_prog)
+        mpid = _RE_PID_PROG.match(pid_prog)
         if not mpid:
             continue
         pid = int(mpid.group(1))
@@ -218,10 +306,9 @@ def parse_netstat_linux(out: str) -> List[Listener]:
                 port=port,
                 proto="tcp",
                 process=proc_name,
-                cmd=cmdline_of_pid(pid),
             )
         )
-    return dedupe(listeners)
+    return with_cmdlines(dedupe(listeners))
 
 
 def discover_windows() -> List[Listener]:
@@ -229,12 +316,13 @@ def discover_windows() -> List[Listener]:
     if code != 0:
         print(err or out, file=sys.stderr)
         return []
+    names = windows_process_names()
     listeners: List[Listener] = []
     for line in out.splitlines():
         line = line.strip()
         if not line.startswith("TCP"):
             continue
-        parts = re.split(r"\s+", line)
+        parts = line.split()
         if len(parts) < 5:
             continue
         local = parts[1]
@@ -242,7 +330,7 @@ def discover_windows() -> List[Listener]:
         pid_str = parts[4]
         if state.upper() != "LISTENING":
             continue
-        m = re.search(r":(\d+)$", local)
+        m = _RE_PORT_SUFFIX.search(local)
         if not m:
             continue
         port = int(m.group(1))
@@ -250,7 +338,7 @@ def discover_windows() -> List[Listener]:
             pid = int(pid_str)
         except ValueError:
             continue
-        proc_name = windows_process_name(pid)
+        proc_name = names.get(pid, "?")
         cmd = proc_name
         listeners.append(
             Listener(pid=pid, port=port, proto="tcp", process=proc_name, cmd=cmd)
@@ -261,15 +349,24 @@ def discover_windows() -> List[Listener]:
 # --------------------------- Process info ---------------------------
 
 
+@functools.lru_cache(maxsize=None)
 def cmdline_of_pid(pid: int) -> str:
     # Best-effort: try /proc, then ps
-    if os.path.exists(f"/proc/{pid}/cmdline"):
+    try:
+        fd = os.open(f"/proc/{pid}/cmdline", os.O_RDONLY)
+    except OSError:
+        pass  # no /proc, or the process is gone
+    else:
         try:
-            with open(f"/proc/{pid}/cmdline", "rb") as f:
-                raw = f.read().replace(b"\x00", b" ").decode(errors="ignore").strip()
-                return raw or "?"
-        except Exception:
+            # Usually a single read; loop for argv longer than a page.
+            raw = b""
+            while chunk := os.read(fd, 4096):
+                raw += chunk
+            return raw.replace(b"\x00", b" ").decode(errors="ignore").strip() or "?"
+        except OSError:
             pass
+        finally:
+            os.close(fd)
     # ps -o command= -p PID
     if which("ps"):
         code, out, _ = run(["ps", "-o", "command=", "-p", str(pid)])
@@ -278,17 +375,47 @@ def cmdline_of_pid(pid: int) -> str:
     return "?"
 
 
-def windows_process_name(pid: int) -> str:
-    # tasklist /FI "PID eq 1234" /FO CSV /NH
-    code, out, err = run(["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV", "/NH"])
+def windows_process_names() -> dict[int, str]:
+    # One tasklist /FO CSV /NH call for every process rather than one per pid.
+    code, out, err = run(["tasklist", "/FO", "CSV", "/NH"])
+    names: dict[int, str] = {}
     if code != 0:
-        return "?"
-    line = out.strip().strip('"')
-    if not line:
-        return "?"
+        return names
     # CSV columns: Image Name, PID, Session Name, Session#, Mem Usage
-    parts = [p.strip('"') for p in line.split(",")]
-    return parts[0] if parts else "?"
+    for row in csv.reader(out.splitlines()):
+        if len(row) >= 2 and row[1].isdigit():
+            names[int(row[1])] = row[0]
+    return names
+
+
+def ps_cmdlines(pids: List[int]) -> dict[int, str]:
+    # ps -o pid=,command= -p 1,2,3: one fork for every pid.
+    cmds: dict[int, str] = {}
+    if not which("ps"):
+        return cmds
+    code, out, _ = run(["ps", "-o", "pid=,command=", "-p", ",".join(map(str, pids))])
+    # ps exits non-zero when some pids are gone; keep whatever it printed.
+    for line in out.splitlines():
+        parts = line.split(None, 1)
+        if parts and parts[0].isdigit():
+            cmds[int(parts[0])] = parts[1].strip() if len(parts) > 1 else "?"
+    return cmds
+
+
+def with_cmdlines(items: List[Listener]) -> List[Listener]:
+    pids = list({it.pid for it in items})
+    if not pids:
+        return items
+    if _SYSTEM == "darwin":
+        # No /proc: one batched ps call instead of a ps fork per pid.
+        cmds = ps_cmdlines(pids)
+    else:
+        # /proc reads are cheap; run them concurrently, once per pid.
+        with ThreadPoolExecutor(max_workers=min(32, len(pids))) as ex:
+            cmds = dict(zip(pids, ex.map(cmdline_of_pid, pids)))
+    for it in items:
+        it.cmd = cmds.get(it.pid) or "?"
+    return items
 
 
 def dedupe(items: List[Listener]) -> List[Listener]:
@@ -306,41 +433,45 @@ def dedupe(items: List[Listener]) -> List[Listener]:
 # --------------------------- Selection ---------------------------
 
 
-def pick_listener(listeners: List[Listener], use_fzf: bool) -> Optional[Listener]:
+def pick_listener(
+    listeners: List[Listener],
+    use_fzf: bool,
+    by_key: Optional[dict[Tuple[int, int], Listener]] = None,
+) -> Optional[Listener]:
     if not listeners:
         print("No listening TCP ports found.")
         return None
     if use_fzf and which("fzf"):
-        return pick_with_fzf(listeners)
+        return pick_with_fzf(listeners, by_key or index_listeners(listeners))
     return pick_with_menu(listeners)
 
 
-def pick_with_fzf(listeners: List[Listener]) -> Optional[Listener]:
+def pick_with_fzf(
+    listeners: List[Listener], by_key: dict[Tuple[int, int], Listener]
+) -> Optional[Listener]:
     try:
-        input_text = "\n".join(item.fzf_line() for item in listeners)
-        proc = subprocess.run(
+        with subprocess.Popen(
             ["fzf", "--ansi", "--no-sort", "--with-nth=1..", "--prompt=port> "],
-            input=input_text,
-            text=True,
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-        )
-        sel = proc.stdout.strip()
+            text=True,
+        ) as proc:
+            # Stream lines to fzf instead of building one big input string.
+            try:
+                for item in listeners:
+                    proc.stdin.write(item.fzf_line() + "\n")
+            except BrokenPipeError:
+                pass  # fzf exited before reading everything
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass  # flushing the rest hit the same closed pipe
+            sel = proc.stdout.read().strip()
         if not sel:
             return None
-        m = re.search(r"pid=(\d+).*?port=(\d+)|port=(\d+).*?pid=(\d+)", sel)
-        if m:
-            pid = int(m.group(1) or m.group(4))
-            port = int(m.group(2) or m.group(3))
-            for item in listeners:
-                if item.pid == pid and item.port == port:
-                    return item
-        # fallback: try to extract first number pairs
-        nums = [int(n) for n in re.findall(r"\d+", sel)]
-        if len(nums) >= 2:
-            pid, port = nums[0], nums[1]
-            for item in listeners:
-                if item.pid == pid and item.port == port:
-                    return item
+        # Selection is our own fzf_line: port=..\tpid=..\tproc=..\tcmd=..
+        fields = dict(kv.split("=", 1) for kv in sel.split("\t", 3))
+        return by_key.get((int(fields["pid"]), int(fields["port"])))
     except Exception as e:
         print(f"fzf selection failed: {e}")
     return None
@@ -369,12 +500,16 @@ def pick_with_menu(listeners: List[Listener]) -> Optional[Listener]:
 # --------------------------- Killing ---------------------------
 
 
-def kill_pid(
-    pid: int, *, force: bool, sig: Optional[int], dry_run: bool
+def kill_pids(
+    pids: List[int], *, force: bool, sig: Optional[int], dry_run: bool
 ) -> Tuple[bool, str]:
-    system = platform.system().lower()
-    if system == "windows":
-        cmd = ["taskkill", "/PID", str(pid)] + (["/F"] if force else [])
+    if _SYSTEM == "windows":
+        # taskkill accepts repeated /PID arguments: one process for all pids.
+        cmd = ["taskkill"]
+        for pid in pids:
+            cmd += ["/PID", str(pid)]
+        if force:
+            cmd.append("/F")
         if dry_run:
             return True, "DRY: " + shlex.join(cmd)
         code, out, err = run(cmd)
@@ -382,17 +517,24 @@ def kill_pid(
         return ok, (out or err or "")
     # POSIX
     sig_to_send = signal.SIGKILL if force else (sig or signal.SIGTERM)
-    if dry_run:
-        return True, f"DRY: os.kill({pid}, {sig_to_send})"
-    try:
-        os.kill(pid, sig_to_send)
-        return True, f"Sent signal {sig_to_send} to PID {pid}"
-    except ProcessLookupError:
-        return False, f"PID {pid} not found"
-    except PermissionError:
-        return False, f"Permission denied to signal PID {pid} (try sudo?)"
-    except Exception as e:
-        return False, f"Failed to signal PID {pid}: {e}"
+    ok = True
+    msgs = []
+    for pid in pids:
+        if dry_run:
+            msgs.append(f"DRY: os.kill({pid}, {sig_to_send})")
+            continue
+        try:
+            os.kill(pid, sig_to_send)
+            msgs.append(f"Sent signal {sig_to_send} to PID {pid}")
+            continue
+        except ProcessLookupError:
+            msgs.append(f"PID {pid} not found")
+        except PermissionError:
+            msgs.append(f"Permission denied to signal PID {pid} (try sudo?)")
+        except Exception as e:
+            msgs.append(f"Failed to signal PID {pid}: {e}")
+        ok = False
+    return ok, "\n".join(msgs)
 
 
 # --------------------------- CLI ---------------------------
@@ -406,6 +548,11 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     gsel.add_argument("--port", type=int, help="Select by TCP port number")
     gsel.add_argument("--pid", type=int, help="Select by PID directly")
     gsel.add_argument("--filter", type=str, help="Substring filter on process or cmd")
+    gsel.add_argument(
+        "--all",
+        action="store_true",
+        help="Kill every listener matching --filter/--port instead of just one",
+    )
     gsel.add_argument(
         "--fzf",
         action="store_true",
@@ -428,7 +575,10 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         "--dry-run", action="store_true", help="Print what would be done, do not kill"
     )
 
-    return p.parse_args(argv)
+    args = p.parse_args(argv)
+    if args.all and (args.pid or not (args.filter or args.port is not None)):
+        p.error("--all needs --filter or --port (and no --pid)")
+    return args
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -436,43 +586,55 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     if args.pid:
         # kill directly
-        selected_listener = Listener(
-            pid=args.pid,
-            port=-1,
-            proto="tcp",
-            process=cmdline_of_pid(args.pid) or "?",
-            cmd=cmdline_of_pid(args.pid) or "?",
-        )
+        targets = [
+            Listener(
+                pid=args.pid,
+                port=-1,
+                proto="tcp",
+                process=cmdline_of_pid(args.pid) or "?",
+                cmd=cmdline_of_pid(args.pid) or "?",
+            )
+        ]
     else:
         listeners = discover_listeners()
         if args.filter:
             kw = args.filter.lower()
-            listeners = [
-                item
-                for item in listeners
-                if kw in (item.process or "").lower() or kw in (item.cmd or "").lower()
-            ]
+            listeners = [item for item in listeners if kw in item.search]
         if args.port is not None:
             candidates = [item for item in listeners if item.port == args.port]
             if not candidates:
                 print(f"No listener found on port {args.port}")
                 return 1
-            selected_listener = candidates[0]
+            # --all: forked servers and SO_REUSEPORT workers all hold the
+            # port, and killing only one leaves it bound.
+            targets = candidates if args.all else candidates[:1]
+        elif args.all:
+            targets = listeners
+            if not targets:
+                print(f"No listener matches '{args.filter}'")
+                return 1
         else:
-            selected_listener = pick_listener(listeners, use_fzf=args.fzf)
+            selected_listener = pick_listener(
+                listeners, use_fzf=args.fzf, by_key=index_listeners(listeners)
+            )
             if selected_listener is None:
                 return 1
+            targets = [selected_listener]
+    pids = list(dict.fromkeys(item.pid for item in targets))
 
     # Confirm
     if not args.yes and not args.dry_run:
-        try:
-            resp = (
-                input(
-                    f"Kill PID {selected_listener.pid} (proc='{selected_listener.process}', port={selected_listener.port if selected_listener.port != -1 else '?'} )? [y/N]: "
-                )
-                .strip()
-                .lower()
+        if len(targets) == 1:
+            t = targets[0]
+            prompt = f"Kill PID {t.pid} (proc='{t.process}', port={t.port if t.port != -1 else '?'} )? [y/N]: "
+        else:
+            for item in targets:
+                print(f"  {item.display_row()}")
+            prompt = (
+                f"Kill {len(pids)} processes ({', '.join(map(str, pids))})? [y/N]: "
             )
+        try:
+            resp = input(prompt).strip().lower()
         except (EOFError, KeyboardInterrupt):
             print()
             return 1
@@ -480,9 +642,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             print("Aborted.")
             return 1
 
-    ok, msg = kill_pid(
-        selected_listener.pid, force=args.force, sig=args.signal, dry_run=args.dry_run
-    )
+    ok, msg = kill_pids(pids, force=args.force, sig=args.signal, dry_run=args.dry_run)
     print(msg)
     return 0 if ok else 1
 
@@ -499,6 +659,9 @@ def cli(
     filter: Optional[str] = typer.Option(
         None, "--filter", help="Substring filter on process or cmd"
     ),
+    all: bool = typer.Option(
+        False, "--all", help="Kill every listener matching --filter/--port"
+    ),
     fzf: bool = typer.Option(
         False, help="Use fzf for interactive selection if available"
     ),
@@ -519,6 +682,8 @@ def cli(
         argv += ["--pid", str(pid)]
     if filter:
         argv += ["--filter", filter]
+    if all:
+        argv += ["--all"]
     if fzf:
         argv += ["--fzf"]
     if yes:
@@ -5,15 +5,19 @@
 # dependencies = [
 #     "quart",
 #     "htpy",
+#     "markupsafe",
 # ]
 # ///
 
 from __future__ import annotations
 
+import os
+import stat as _stat
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 
+from markupsafe import Markup, escape
 from quart import Quart, Response, send_file
 from quart.typing import ResponseReturnValue
 from htpy import (
@@ -36,6 +40,9 @@ from htpy import (
 
 app = Quart(__name__)
 
+# Last rendered listing (utf-8 encoded), reused until the scanned entries change.
+_explorer_cache: dict[str, object] = {"entries": None, "body": b""}
+
 
 # ---------------------------
 # Models & helpers
@@ -69,59 +76,61 @@ class Entry:
 
     @property
     def display_mtime(self) -> str:
-        dt = datetime.fromtimestamp(self.mtime)
-        return dt.strftime("%Y-%m-%d %H:%M")
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(self.mtime))
 
 
 def scan_cwd() -> list[Entry]:
     """Return entries for the current working directory (hidden files excluded)."""
     entries: list[Entry] = []
-    for p in Path(".").iterdir():
-        if p.name.startswith("."):
-            continue
-        stat = p.stat()
-        entries.append(
-            Entry(
-                name=p.name, is_dir=p.is_dir(), size=stat.st_size, mtime=stat.st_mtime
+    # One (cached) stat per entry; the folder check reuses its st_mode.
+    # Symlinks are followed, so a link to a folder lists as a folder.
+    with os.scandir(".") as it:
+        for de in it:
+            if de.name.startswith("."):
+                continue
+            st = de.stat()
+            entries.append(
+                Entry(
+                    name=de.name,
+                    is_dir=_stat.S_ISDIR(st.st_mode),
+                    size=st.st_size,
+                    mtime=st.st_mtime,
+                )
             )
-        )
 
     # Sort: folders first, then files, both alphabetically case-insensitive
     entries.sort(key=lambda e: (not e.is_dir, e.name.lower()))
     return entries
 
 
-# --- Icon factories (inline SVG, Tailwind-colored) ---
+# --- Icons (inline SVG, Tailwind-colored), rendered once at import ---
 
+FOLDER_ICON = str(
+    svg(
+        xmlns="http://www.w3.org/2000/svg",
+        viewBox="0 0 24 24",
+        fill="currentColor",
+        class_="w-5 h-5 text-amber-500",
+    )[
+        svg_path(
+            d="M2.25 6.75A2.25 2.25 0 0 1 4.5 4.5h4.318a2.25 2.25 0 0 1 1.59.66l1.232 1.232a2.25 2.25 0 0 0 1.59.658H19.5a2.25 2.25 0 0 1 2.25 2.25v7.5A2.25 2.25 0 0 1 19.5 19.5h-15A2.25 2.25 0 0 1 2.25 17.25v-10.5Z"
+        ),
+    ]
+)
 
-def folder_icon() -> str:
-    return str(
-        svg(
-            xmlns="http://www.w3.org/2000/svg",
-            viewBox="0 0 24 24",
-            fill="currentColor",
-            class_="w-5 h-5 text-amber-500",
-        )[
-            svg_path(
-                d="M2.25 6.75A2.25 2.25 0 0 1 4.5 4.5h4.318a2.25 2.25 0 0 1 1.59.66l1.232 1.232a2.25 2.25 0 0 0 1.59.658H19.5a2.25 2.25 0 0 1 2.25 2.25v7.5A2.25 2.25 0 0 1 19.5 19.5h-15A2.25 2.25 0 0 1 2.25 17.25v-10.5Z"
-            ),
-        ]
-    )
-
-
-def file_icon() -> str:
-    return str(
-        svg(
-            xmlns="http://www.w3.org/2000/svg",
-            viewBox="0 0 24 24",
-            fill="currentColor",
-            class_="w-5 h-5 text-slate-500",
-        )[
-            svg_path(
-                d="M19.5 14.25v-2.379a2.25 2.25 0 0 0-.659-1.591l-4.121-4.121A2.25 2.25 0 0 0 13.128 5.5H8.25A2.25 2.25 0 0 0 6 7.75v8.5A2.25 2.25 0 0 0 8.25 18.5h9A2.25 2.25 0 0 0 19.5 16.25v-2Z"
-            ),
-        ]
-    )
+
+FILE_ICON = str(
+    svg(
+        xmlns="http://www.w3.org/2000/svg",
+        viewBox="0 0 24 24",
+        fill="currentColor",
+        class_="w-5 h-5 text-slate-500",
+    )[
+        svg_path(
+            d="M19.5 14.25v-2.379a2.25 2.25 0 0 0-.659-1.591l-4.121-4.121A2.25 2.25 0 0 0 13.128 5.5H8.25A2.25 2.25 0 0 0 6 7.75v8.5A2.25 2.25 0 0 0 8.25 18.5h9A2.25 2.25 0 0 0 19.5 16.25v-2Z"
+        ),
+    ]
+)
 
 
 # ---------------------------
@@ -129,29 +138,41 @@ def file_icon() -> str:
 # ---------------------------
 
 
+# One row per entry: formatted as a plain string rather than an htpy tree,
+# since this is the only part that grows with the directory.
+ROW_HTML = (
+    '<div class="group grid grid-cols-[1fr_160px_100px_180px] items-center gap-3 px-3 py-2 rounded-lg hover:bg-slate-100">'
+    '<div class="flex items-center gap-3 overflow-hidden">'
+    '<span class="shrink-0 inline-block">{icon}</span>'
+    '<span class="truncate text-slate-800 font-medium">{name}</span>'
+    "</div>"
+    '<span class="text-slate-500 text-sm">{kind}</span>'
+    '<span class="text-slate-700 tabular-nums text-sm">{size}</span>'
+    '<span class="text-slate-500 text-sm">{mtime}</span>'
+    "</div>"
+)
+
+
 def render_explorer(entries: list[Entry]) -> str:
-    rows = []
+    parts = []
+    n_dirs = 0
     for e in entries:
-        icon_html = folder_icon() if e.is_dir else file_icon()
-        rows.append(
-            div(
-                class_="group grid grid-cols-[1fr_160px_100px_180px] items-center gap-3 px-3 py-2 rounded-lg hover:bg-slate-100"
-            )[
-                div(class_="flex items-center gap-3 overflow-hidden")[
-                    # icon
-                    span(class_="shrink-0 inline-block")[icon_html],
-                    # name
-                    span(class_="truncate text-slate-800 font-medium")[e.name],
-                ],
-                span(class_="text-slate-500 text-sm")[e.kind],
-                span(class_="text-slate-700 tabular-nums text-sm")[e.display_size],
-                span(class_="text-slate-500 text-sm")[e.display_mtime],
-            ]
+        n_dirs += e.is_dir
+        parts.append(
+            ROW_HTML.format(
+                icon=FOLDER_ICON if e.is_dir else FILE_ICON,
+                name=escape(e.name),
+                kind=escape(e.kind),
+                size=e.display_size,
+                mtime=e.display_mtime,
+            )
         )
 
-    if not rows:
-        rows = [
-            div(class_="px-3 py-10 text-center text-slate-500")["This folder is empty."]
+    if parts:
+        rows = Markup("".join(parts))
+    else:
+        rows = div(class_="px-3 py-10 text-center text-slate-500")[
+            "This folder is empty."
         ]
 
     doc = html[
@@ -179,7 +200,7 @@ def render_explorer(entries: list[Entry]) -> str:
                 tag_header(class_="mb-6 flex items-center justify-between")[
                     h1(class_="text-xl font-semibold")["Files"],
                     span(class_="text-sm text-slate-500")[
-                        f"{sum(1 for e in entries if e.is_dir)} folders • {sum(1 for e in entries if not e.is_dir)} files"
+                        f"{n_dirs} folders • {len(entries) - n_dirs} files"
                     ],
                 ],
                 # column headers
@@ -192,7 +213,7 @@ def render_explorer(entries: list[Entry]) -> str:
                     span["Modified"],
                 ],
                 # rows
-                div(class_="space-y-1")[*rows],
+                div(class_="space-y-1")[rows],
                 tag_footer(class_="mt-8 text-xs text-slate-400")[
                     "Auto-generated because index.html was not found."
                 ],
@@ -215,8 +236,10 @@ async def serve_index() -> ResponseReturnValue:
         return await send_file("index.html")
 
     entries = scan_cwd()
-    html_out = render_explorer(entries)
-    return Response(html_out, mimetype="text/html; charset=utf-8")
+    if entries != _explorer_cache["entries"]:
+        _explorer_cache["entries"] = entries
+        _explorer_cache["body"] = render_explorer(entries).encode("utf-8")
+    return Response(_explorer_cache["body"], mimetype="text/html; charset=utf-8")
 
 
 @app.route("/<path:filename>")
@@ -2,28 +2,31 @@
 # -*- coding: utf-8 -*-
 # /// script
 # requires-python = ">=3.9"
-# dependencies = ["typer>=0.12", "rich>=13.7"]
+# dependencies = ["rich>=13.7"]
 # ///
 
 
 from __future__ import annotations
 
+import argparse
 import os
 import platform
+import sys
 from pathlib import Path
-from typing import Dict, Iterable, List, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Union
 
-import typer
-from rich.console import Console, Group
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
-from rich.text import Text
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.syntax import Syntax
+    from rich.text import Text
 
-app = typer.Typer(
-    add_completion=False, help="Generate env var setup commands for SSL certificates."
-)
-console = Console()
+# Plain output is the default; rich is only imported for --pretty since its
+# import cost outweighs everything else this script does.
+_COLOR = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+
+def _style(text: str, code: str) -> str:
+    return f"\x1b[{code}m{text}\x1b[0m" if _COLOR else text
 
 
 def _build_env_vars(cert_path: Path) -> Dict[str, Union[str, int]]:
@@ -42,7 +45,10 @@ def _build_env_vars(cert_path: Path) -> Dict[str, Union[str, int]]:
     }
 
 
-def _print_current_env_vars(env_keys: Iterable[str]) -> None:
+def _print_current_env_vars(console: Console, env_keys: Iterable[str]) -> None:
+    from rich.table import Table
+    from rich.text import Text
+
     table = Table(title="Current Environment Variables", expand=True)
     table.add_column("Variable", style="cyan", no_wrap=True)
     table.add_column("Current Value", style="white")
@@ -60,11 +66,17 @@ def _print_current_env_vars(env_keys: Iterable[str]) -> None:
 
 
 def _section(
-    title: str, items: List[Union[str, Text, Syntax]], subtitle: str | None = None
+    console: Console,
+    title: str,
+    items: List[Union[str, Text, Syntax]],
+    subtitle: str | None = None,
 ) -> None:
     """
     Render a titled panel with a stack of Rich renderables (strings/Text/Syntax).
     """
+    from rich.console import Group
+    from rich.panel import Panel
+
     group = Group(*items)
     console.print(Panel.fit(group, title=title, subtitle=subtitle))
 
@@ -89,7 +101,14 @@ def _bash_commands(env_vars: Dict[str, Union[str, int]]) -> str:
     return "\n".join(lines)
 
 
-def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) -> None:
+def _show_instructions_pretty(
+    env_vars: Dict[str, Union[str, int]], show_all: bool
+) -> int:
+    from rich.console import Console
+    from rich.syntax import Syntax
+    from rich.text import Text
+
+    console = Console()
     sysname = platform.system()
 
     console.print(
@@ -99,7 +118,7 @@ def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) ->
     )
     console.print()
 
-    _print_current_env_vars(env_vars.keys())
+    _print_current_env_vars(console, env_vars.keys())
 
     want_windows = show_all or sysname == "Windows"
     want_posix = show_all or sysname in {"Linux", "Darwin"}
@@ -107,6 +126,7 @@ def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) ->
     if want_windows:
         code = _windows_commands(env_vars)
         _section(
+            console,
             "Windows Setup (Command Prompt)",
             [
                 "[green]Run the following commands in Command Prompt:[/green]",
@@ -119,6 +139,7 @@ def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) ->
     if want_posix:
         code = _bash_commands(env_vars)
         _section(
+            console,
             "macOS/Linux Setup (bash/zsh)",
             [
                 "[green]Add the following lines to your shell config file "
@@ -134,29 +155,104 @@ def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) ->
         console.print(
             Text(f"Unsupported operating system: {sysname}", style="bold red")
         )
-        raise typer.Exit(code=1)
+        return 1
+    return 0
 
 
-@app.command()
-def main(
-    cert_path: Path = typer.Argument(
-        Path("~/.config/certs/cacert.pem"),
-        help="Path to the certificate file.",
-    ),
-    show_all: bool = typer.Option(
-        False,
-        "--all",
-        "-a",
-        help="Show setup instructions for all supported operating systems.",
-    ),
-) -> None:
+def _print_section(title: str, lines: List[str]) -> None:
+    print(_style(f"== {title} ==", "1"))
+    for line in lines:
+        print(line)
+    print()
+
+
+def _show_instructions(env_vars: Dict[str, Union[str, int]], show_all: bool) -> int:
+    sysname = platform.system()
+
+    print(_style(f"NOTE: Using certificate path: {env_vars['SSL_CERT_FILE']}", "33"))
+    print()
+
+    print(_style("Current Environment Variables", "1"))
+    width = max(len("Variable"), *(len(k) for k in env_vars))
+    print(f"{'Variable':<{width}}  Current Value")
+    for key in env_vars:
+        value = os.environ.get(key)
+        if value is None:
+            shown = _style("(not set)", "31")
+        else:
+            shown = value if len(value) <= 45 else value[:42] + "..."
+        print(f"{_style(f'{key:<{width}}', '36')}  {shown}")
+    print()
+
+    want_windows = show_all or sysname == "Windows"
+    want_posix = show_all or sysname in {"Linux", "Darwin"}
+
+    if want_windows:
+        _print_section(
+            "Windows Setup (Command Prompt), persistent via setx",
+            [
+                _style("Run the following commands in Command Prompt:", "32"),
+                "",
+                _windows_commands(env_vars),
+            ],
+        )
+
+    if want_posix:
+        _print_section(
+            "macOS/Linux Setup (bash/zsh)",
+            [
+                _style(
+                    "Add the following lines to your shell config file "
+                    "(`~/.bashrc`, `~/.zshrc`, etc.):",
+                    "32",
+                ),
+                "",
+                _bash_commands(env_vars),
+                "",
+                _style("Then restart your terminal to apply changes.", "36"),
+            ],
+        )
+
+    if not show_all and not (want_windows or want_posix):
+        print(_style(f"Unsupported operating system: {sysname}", "1;31"))
+        return 1
+    return 0
+
+
+def main(argv: List[str] | None = None) -> int:
     """
     Generate environment variable setup commands for SSL certificates and show
     current values in a table.
     """
-    env_vars = _build_env_vars(cert_path)
-    _show_instructions(env_vars, show_all)
+    parser = argparse.ArgumentParser(
+        description="Generate env var setup commands for SSL certificates."
+    )
+    parser.add_argument(
+        "cert_path",
+        nargs="?",
+        type=Path,
+        default=Path("~/.config/certs/cacert.pem"),
+        help="Path to the certificate file.",
+    )
+    parser.add_argument(
+        "-a",
+        "--all",
+        dest="show_all",
+        action="store_true",
+        help="Show setup instructions for all supported operating systems.",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Render tables and panels with rich.",
+    )
+    args = parser.parse_args(argv)
+
+    env_vars = _build_env_vars(args.cert_path)
+    if args.pretty:
+        return _show_instructions_pretty(env_vars, args.show_all)
+    return _show_instructions(env_vars, args.show_all)
 
 
 if __name__ == "__main__":
-    app()
+    sys.exit(main())
@@ -8,11 +8,14 @@
 # ///
 
 
+import fcntl
+import functools
 import os
 import re
 import tty
 import termios
 import select
+import sys
 import time
 import shutil
 from rich.console import Console, Group
@@ -26,105 +29,138 @@ WIDTH = shutil.get_terminal_size((100, 24)).columns
 # ---------- OSC helpers ----------
 BEL = b"\x07"
 ST = b"\x1b\\"
-RE_OSC4 = re.compile(rb"\x1b\]4;(\d+);([^\x07\x1b]+)(?:\x07|\x1b\\)")
-RE_OSC1X = re.compile(rb"\x1b\](1[0-9]);([^\x07\x1b]+)(?:\x07|\x1b\\)")
+# OSC 4 (palette) and OSC 10–19 (dynamic colors) replies, BEL or ST terminated
+RE_OSC = re.compile(
+    rb"\x1b\](?:4;(?P<idx>\d+)|(?P<code>1[0-9]));(?P<val>[^\x07\x1b]+)(?:\x07|\x1b\\)"
+)
+DYNAMIC_CODES = (10, 11, 12, 13, 14, 17, 19)
+RE_RGB = re.compile(r"rgb:([0-9a-f]+)/([0-9a-f]+)/([0-9a-f]+)")
+RE_HEX7 = re.compile(r"#[0-9a-fA-F]{6}\Z")
+
+
+def _read_reply(fd, expected=1, timeout=0.25):
+    # Read until `expected` replies have been terminated (BEL or ST), sharing
+    # one deadline between them so silent terminals cost a single timeout.
+    end = time.monotonic() + timeout
+    if sys.platform == "linux":
+        # Register once instead of rebuilding fd sets on every select().
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+
+        def ready(left):
+            return poller.poll(left * 1000)
+    else:
+        # macOS poll() doesn't support tty devices; keep select() there.
+        def ready(left):
+            return select.select([fd], [], [], left)[0]
 
-
-def _read_reply(fd, timeout=0.25):
-    end = time.time() + timeout
     buf = bytearray()
-    while time.time() < end:
-        r, _, _ = select.select([fd], [], [], max(0, end - time.time()))
-        if not r:
+    seen = 0  # terminators so far, counted over new bytes only
+    while (left := end - time.monotonic()) > 0:
+        if not ready(left):
             break
-        chunk = os.read(fd, 4096)
+        try:
+            chunk = os.read(fd, 4096)
+        except BlockingIOError:
+            continue  # spurious wakeup; wait again
         if not chunk:
             break
+        # Count ST from one byte back, since it can be split across reads.
+        start = max(0, len(buf) - 1)
         buf.extend(chunk)
-        if BEL in buf or ST in buf:
+        seen += chunk.count(BEL) + buf.count(ST, start)
+        if seen >= expected:
             break
-    return bytes(buf)
+    return buf  # bytearray: the regex scans it directly, no copy needed
 
 
 def _to_hex(s: str) -> str:
     s = s.strip().lower()
-    if s.startswith("rgb:"):
-        parts = s[4:].split("/")
-
-        def pick2(h):
-            return (h.strip() + "0" * 2)[:2]
-
-        r, g, b = (pick2(p) for p in parts[:3])
-        return f"#{r}{g}{b}"
+    if m := RE_RGB.match(s):
+        # X11 rgb:R/G/B with 1–4 hex digits per channel; keep the top byte.
+        return f"#{m[1][:2]:0<2}{m[2][:2]:0<2}{m[3][:2]:0<2}"
     if s.startswith("#"):
         h = s[1:]
-        if len(h) == 3:
-            return "#" + "".join(c * 2 for c in h)
         if len(h) == 6:
-            return "#" + h
+            return s
+        if len(h) == 3:
+            return f"#{h[0] * 2}{h[1] * 2}{h[2] * 2}"
         if len(h) == 12:
-            return "#" + h[0:2] + h[4:6] + h[8:10]
+            return f"#{h[0:2]}{h[4:6]}{h[8:10]}"
     return s  # unknown; just show it
 
 
-def query_osc_palette(indices):
-    out = {}
+def query_osc(indices=(), codes=()):
+    # Palette `indices` (OSC 4) and dynamic `codes` (OSC 10–19) in one round
+    # trip; returns (palette, dynamic) dicts of hex colors.
+    indices, codes = set(indices), set(codes)
+    pal, dyn = {}, {}
+    queries = [f"\x1b]4;{n};?\x07" for n in indices]
+    queries += [f"\x1b]{code};?\x07" for code in codes]
+    if not queries:
+        return pal, dyn
     try:
         with open("/dev/tty", "rb+", buffering=0) as t:
             fd = t.fileno()
             old = termios.tcgetattr(fd)
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
             try:
                 tty.setraw(fd)
-                for n in indices:
-                    os.write(fd, f"\x1b]4;{n};?\x07".encode())
-                    rep = _read_reply(fd)
-                    for m in RE_OSC4.finditer(rep):
-                        if int(m.group(1)) == n:
-                            out[n] = _to_hex(m.group(2).decode(errors="replace"))
+                # Non-blocking, so a read after poll/select can never stall.
+                fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+                # All queries in one write, then collect every reply at once.
+                os.write(fd, "".join(queries).encode())
+                rep = _read_reply(fd, len(queries))
             finally:
+                fcntl.fcntl(fd, fcntl.F_SETFL, flags)
                 termios.tcsetattr(fd, termios.TCSADRAIN, old)
     except Exception:
-        pass
-    return out
+        return pal, dyn
+    # One pass over the replies for both kinds of query.
+    for m in RE_OSC.finditer(rep):
+        if m["idx"] is not None:
+            key, wanted, out = int(m["idx"]), indices, pal
+        else:
+            key, wanted, out = int(m["code"]), codes, dyn
+        if key in wanted:
+            out[key] = _to_hex(m["val"].decode(errors="replace"))
+    return pal, dyn
 
 
-def query_dynamic(codes=(10, 11, 12, 13, 14, 17, 19)):
-    out = {}
-    try:
-        with open("/dev/tty", "rb+", buffering=0) as t:
-            fd = t.fileno()
-            old = termios.tcgetattr(fd)
-            try:
-                tty.setraw(fd)
-                for code in codes:
-                    os.write(fd, f"\x1b]{code};?\x07".encode())
-                    rep = _read_reply(fd)
-                    for m in RE_OSC1X.finditer(rep):
-                        if int(m.group(1)) == code:
-                            out[code] = _to_hex(m.group(2).decode(errors="replace"))
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old)
-    except Exception:
-        pass
-    return out
+def query_osc_palette(indices):
+    return query_osc(indices=indices)[0]
+
+
+def query_dynamic(codes=DYNAMIC_CODES):
+    return query_osc(codes=codes)[1]
 
 
 # ---------- Small rendering helpers ----------
+def _is_hex7(value) -> bool:
+    # A usable #rrggbb color; anything else falls back to dim text / 256-color.
+    return isinstance(value, str) and RE_HEX7.match(value) is not None
+
+
+# Swatches are shared between calls. Callers either append_text() them, which
+# copies, or place them in a table cell, which only reads them, so a cached
+# Text is never mutated.
+@functools.lru_cache(maxsize=None)
 def swatch_256_bg(idx: int, width: int = 1) -> Text:
     t = Text(" " * width)
     t.stylize(f"on color({idx})")
     return t
 
 
+@functools.lru_cache(maxsize=256)
 def swatch_true_bg(hexval: str, width: int = 2) -> Text:
     t = Text(" " * width)
-    if isinstance(hexval, str) and hexval.startswith("#") and len(hexval) == 7:
+    if _is_hex7(hexval):
         t.stylize(f"on {hexval}")
     return t
 
 
 def colored_hex_text(hexval: str) -> Text:
-    if isinstance(hexval, str) and hexval.startswith("#") and len(hexval) == 7:
+    if _is_hex7(hexval):
         return Text(hexval, style=hexval)
     return Text(hexval or "—", style="italic dim")
 
@@ -139,7 +175,7 @@ def section_ansi_0_15(pal_hex: dict) -> Panel:
         hx = pal_hex.get(idx)
         t = Text()
         sw = Text(f" {hx or '—'} ")
-        if isinstance(hx, str) and hx.startswith("#") and len(hx) == 7:
+        if _is_hex7(hx):
             sw.stylize(f"on {hx}")  # truecolor bg
         else:
             sw.stylize(f"on color({idx})")  # 256-color fallback
@@ -183,7 +219,7 @@ def section_dynamic(dyn_hex: dict) -> Panel:
     tbl.add_column(no_wrap=True)
     tbl.add_column(no_wrap=True)
     tbl.add_column(no_wrap=True)
-    for code in (10, 11, 12, 13, 14, 17, 19):
+    for code in DYNAMIC_CODES:
         hx = dyn_hex.get(code)
         tbl.add_row(
             Text(str(code), style="dim"),
@@ -194,43 +230,43 @@ def section_dynamic(dyn_hex: dict) -> Panel:
     return Panel(tbl, title="Dynamic UI (OSC 10–19)")
 
 
+# The cube and gray ramp don't depend on the terminal's replies: build each
+# panel once and hand back the same (read-only) renderable afterwards.
+@functools.cache
 def section_cube() -> Panel:
     # Color cube with Taskwarrior-style labels:
     #   header row:      0            1            2            3            4            5
     #   header sub-row:  0 1 2 3 4 5  0 1 2 3 4 5  ...
     #   row labels:      0..5 down the left side (G axis)
-    grid = Table.grid(padding=(0, 1))
-    grid.add_column(justify="right", no_wrap=True)  # row labels (G)
-    for _ in range(6):
-        grid.add_column(no_wrap=True)  # columns for R=0..5
-
-    # Header line: "0 1 2 3 4 5" centered over each R column
-    header_top = [Text(" ", style="dim")] + [
-        Text(f"{r}", style="dim") for r in range(6)
-    ]
-    grid.add_row(*header_top)
-
-    # Header sub-line: "0 1 2 3 4 5" within each column (B axis legend)
-    header_seq = [Text(" ", style="dim")] + [
-        Text("0 1 2 3 4 5", style="dim") for _ in range(6)
-    ]
-    grid.add_row(*header_seq)
+    # Laid out by hand as a single Text (label, then six 12-wide R columns,
+    # one space apart): Rich renders this several times faster than the
+    # equivalent 7-column Table.grid.
+    cube = Text(no_wrap=True, overflow="crop")
+
+    # Header line: R column numbers, and the B axis legend within each column
+    for heading in [f"{r:<12}" for r in range(6)], ["0 1 2 3 4 5 "] * 6:
+        cube.append(" ", style="dim")
+        for cell in heading:
+            cube.append(" ")
+            cube.append(cell, style="dim")
+        cube.append("\n")
 
     # Body: rows for G=0..5, each column shows a strip for B=0..5 at that R
     for g in range(6):
-        row_cells = [Text(f"{g}", style="dim")]
+        cube.append(f"{g}", style="dim")
         for r in range(6):
-            strip = Text()
+            cube.append(" ")
+            base = 16 + 36 * r + 6 * g
             for b in range(6):
-                idx = 16 + 36 * r + 6 * g + b
-                strip.append_text(swatch_256_bg(idx, 2))
-            row_cells.append(strip)
-        grid.add_row(*row_cells)
+                cube.append("  ", style=f"on color({base + b})")
+        if g < 5:
+            cube.append("\n")
 
     title = "Color cube rgb000 – rgb555 (also color16 – color231)"
-    return Panel(grid, title=title)
+    return Panel(cube, title=title)
 
 
+@functools.cache
 def section_gray() -> Panel:
     # One-line gray ramp (232..255) with Taskwarrior-style labels on top.
     indices = [232 + i for i in range(24)]
@@ -259,8 +295,13 @@ def section_gray() -> Panel:
 
 # ---------- Main ----------
 def main():
-    pal_hex = query_osc_palette(range(16))
-    dyn_hex = query_dynamic()
+    # Probing toggles raw mode on /dev/tty and can wait out the reply timeout;
+    # TERM_COLORS_NO_PROBE skips it and shows the 256-color fallbacks instead.
+    if os.environ.get("TERM_COLORS_NO_PROBE"):
+        pal_hex, dyn_hex = {}, {}
+    else:
+        # Palette and dynamic colors share one raw-mode session and one read.
+        pal_hex, dyn_hex = query_osc(range(16), DYNAMIC_CODES)
 
     s1 = section_ansi_0_15(pal_hex)
     s2 = section_dynamic(dyn_hex)
@@ -95,34 +95,34 @@ def timer(
     )
 
     task = progress.add_task("Counting down", total=total_seconds)
-
-    def _render_body(remaining: int) -> Panel:
-        table = Table.grid(expand=True)
-        table.add_column(justify="center")
-        big_time = Align.center(
-            Text(_format_mmss(remaining), style="bold magenta", justify="center"),
-            vertical="middle",
-        )
-        table.add_row(big_time)
-        table.add_row(
-            Text.from_markup(
-                f"[dim]ETA:[/] {end_time:%I:%M:%S %p}  •  [dim]Seconds left:[/] {remaining}"
-            )
-        )
-        return Panel(
-            table, border_style="magenta", title="Time Remaining", box=box.ROUNDED
-        )
-
-    console.print(Rule(style="green"))
-    console.print(header)
-    console.print(Rule(style="green"))
+    eta = f"{end_time:%I:%M:%S %p}"  # fixed for the whole countdown
+
+    # Built once; the loop only rewrites the two Text objects in place and
+    # Live repaints the same renderable on its own refresh schedule.
+    big_time = Text(_format_mmss(total_seconds), style="bold magenta", justify="center")
+    info = Text.from_markup(f"[dim]ETA:[/] {eta}  •  [dim]Seconds left:[/] ")
+    info_prefix = info.plain
+    info.append(str(total_seconds))
+
+    table = Table.grid(expand=True)
+    table.add_column(justify="center")
+    table.add_row(Align.center(big_time, vertical="middle"))
+    table.add_row(info)
+    body = Panel(table, border_style="magenta", title="Time Remaining", box=box.ROUNDED)
+
+    # Inside `with console:` Rich buffers the prints and writes them once.
+    with console:
+        console.print(Rule(style="green"))
+        console.print(header)
+        console.print(Rule(style="green"))
 
     try:
         # Use Live to update the same renderable instead of printing per tick.
         fps = max(1, int(1 / max(0.01, refresh)))
         start = monotonic()
+        last_elapsed = -1
         with Live(
-            Group(_render_body(total_seconds), progress),
+            Group(body, progress),
             refresh_per_second=fps,
             console=console,
             transient=False,
@@ -131,12 +131,22 @@ def timer(
                 elapsed = int(monotonic() - start)
                 remaining = max(0, total_seconds - elapsed)
 
-                progress.update(task, completed=elapsed)
-                live.update(Group(_render_body(remaining), progress))
+                # Whole seconds only change once per second; skip the
+                # updates on the ticks in between.
+                if elapsed != last_elapsed:
+                    last_elapsed = elapsed
+                    progress.update(task, completed=elapsed)
+                    # Live's refresh thread renders these Texts; hold its
+                    # lock so a frame never sees one half-updated.
+                    with live._lock:
+                        big_time.plain = _format_mmss(remaining)
+                        info.plain = f"{info_prefix}{remaining}"
 
                 if remaining <= 0:
                     break
-                sleep(min(refresh, 0.25))
+                # Wake at the next whole second after start, when the clock
+                # next changes; Live animates the spinner in between.
+                sleep(max(0.0, start + elapsed + 1 - monotonic()))
 
         done_text = message or "Your timer has finished!"
         finish_panel = Panel(
@@ -145,9 +155,10 @@ def timer(
             border_style="yellow",
             box=box.HEAVY,
         )
-        console.print("\n")
-        console.print(finish_panel)
-        console.print(Rule(style="yellow"))
+        with console:
+            console.print("\n")
+            console.print(finish_panel)
+            console.print(Rule(style="yellow"))
 
         if beep:
             # Terminal bell (may not work in all terminals)